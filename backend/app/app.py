@@ -1,19 +1,23 @@
 from flask import Flask, render_template
 from flask_sqlalchemy import SQLAlchemy
 from app.config import Config
+from app.metrics import metrics
 
 db = SQLAlchemy()
 
-def create_app():
+def create_app(config_object=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_object)
     db.init_app(app)
+    metrics.enabled = app.config["METRICS_ENABLED"]
 
     from app.routes.video_routes import video_bp
     from app.routes.job_routes import job_bp
+    from app.routes.metrics_routes import metrics_bp
 
     app.register_blueprint(video_bp)
     app.register_blueprint(job_bp)
+    app.register_blueprint(metrics_bp)
 
     @app.route("/", methods=["GET"])
     def index():
@@ -3,7 +3,8 @@ import os
 BASE_DIR = os.path.abspath(os.path.dirname((__file__)))
 
 class Config:
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(BASE_DIR, "app.db")}"
+    # 여러 서버에서 워커를 돌릴 때는 DATABASE_URL로 공유 DB(PostgreSQL 등)를 지정
+    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or f"sqlite:///{os.path.join(BASE_DIR, "app.db")}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     UPLOADS_FOLDER = os.path.join(BASE_DIR, "..", "uploads")
@@ -17,4 +18,77 @@ class Config:
     os.makedirs(OUTPUTS_FOLDER, exist_ok=True)
 
     PREVIEWS_FOLDER = os.path.join(BASE_DIR, "static", "previews")
-    os.makedirs(PREVIEWS_FOLDER, exist_ok=True)
\ No newline at end of file
+    os.makedirs(PREVIEWS_FOLDER, exist_ok=True)
+    PREVIEW_MAX_WIDTH = 640
+
+    # 편집기 탐색용 저해상도 프록시 (짧은 GOP + faststart)
+    PROXIES_FOLDER = os.path.join(BASE_DIR, "..", "proxies")
+    os.makedirs(PROXIES_FOLDER, exist_ok=True)
+
+    PROXY_HEIGHT = 480
+    PROXY_GOP_SECONDS = 0.5
+    PROXY_MAX_BITRATE = "1M"
+    PROXY_CACHE_MAX_AGE = 60 * 60 * 24
+
+    # 트랙별 얼굴 썸네일 + 타임라인 스프라이트 시트 (THUMBNAIL_TIMELINE_INTERVAL 프레임마다 1장)
+    THUMBNAILS_FOLDER = os.path.join(BASE_DIR, "..", "thumbnails")
+    os.makedirs(THUMBNAILS_FOLDER, exist_ok=True)
+
+    THUMBNAIL_SIZE = 96
+    THUMBNAIL_TIMELINE_INTERVAL = 30
+    THUMBNAIL_TILE_WIDTH = 160
+    THUMBNAIL_CACHE_MAX_AGE = 60 * 60 * 24
+
+    # 탐지 해상도: 1/2/4/8 배 축소 디코딩 또는 "auto" (긴 변이 DETECTION_MIN_SIDE 이상 유지)
+    DETECTION_SCALE = "auto"
+    DETECTION_MIN_SIDE = 960
+
+
+    MODEL_PATH = os.path.join(BASE_DIR, "..", "model", "yolov11n-face_openvino_model")
+    MODEL_WARMUP_RUNS = 1
+
+    # "openvino": IR 직접 실행 (AsyncInferQueue), "ultralytics": YOLO 래퍼 사용
+    DETECTOR_BACKEND = "openvino"
+    OPENVINO_DEVICE = "CPU"
+    OPENVINO_CACHE_DIR = os.path.join(BASE_DIR, "..", "model", "openvino_cache")
+
+    DETECTION_CONF = 0.25
+    DETECTION_IOU = 0.7
+    DETECTION_MAX_DET = 300
+
+    METRICS_ENABLED = True
+
+    # 종류별 디스크 사용량 상한(MB). frames/proxy/output은 초과 시 오래 안 쓴 순서로 삭제 후 필요할 때 재생성,
+    # upload는 삭제하지 않고 상한을 넘는 업로드를 거절
+    STORAGE_QUOTAS_MB = {
+        "upload": 50 * 1024,
+        "frames": 20 * 1024,
+        "proxy": 5 * 1024,
+        "output": 10 * 1024
+    }
+    STORAGE_CLEANUP_INTERVAL = 300
+    # 산출물 접근 시각(LRU 기준) 갱신 최소 간격(초)
+    STORAGE_TOUCH_INTERVAL = 300
+
+    # 작업 큐: 웹 서버는 작업을 등록만 하고 워커가 가져가서 처리 (0이면 웹 프로세스에서는 처리하지 않음, python worker.py로 실행)
+    JOB_QUEUE_BACKEND = "database"
+    JOB_WORKERS_IN_PROCESS = int(os.environ.get("JOB_WORKERS_IN_PROCESS", 1))
+    JOB_POLL_INTERVAL = 2
+    JOB_HEARTBEAT_INTERVAL = 10
+    JOB_HEARTBEAT_TIMEOUT = 60
+    JOB_MAX_ATTEMPTS = 3
+    # python worker.py 프로세스의 /metrics 포트 (웹 /metrics에는 큐 상태와 웹 프로세스 지표만 포함)
+    WORKER_METRICS_PORT = int(os.environ.get("WORKER_METRICS_PORT", 9101))
+    # 클러스터 전체에서 동시에 처리 가능한 작업 수 (대기 시간 추정용)
+    JOB_WORKER_SLOTS = int(os.environ.get("JOB_WORKER_SLOTS", 1))
+
+    # 작업 접수 제어: 비용(메가픽셀 x 프레임)과 처리량으로 예상 시간을 계산해 한도를 넘으면 거절
+    ADMISSION_DEFAULT_MPX_PER_SECOND = 60.0
+    # 영상 1개의 예상 처리 시간 상한(초). None이면 제한 없이 대기열에 넣고 스케줄러가 순서를 정함 (설정 시 업로드 단계에서 거절)
+    ADMISSION_MAX_JOB_SECONDS = None
+    ADMISSION_MAX_WAIT_SECONDS = 60 * 30
+    ADMISSION_MAX_QUEUE_LENGTH = 50
+    ADMISSION_RETRY_AFTER = 30
+    # 이 사용률 이상이면 메모리는 접수 거절, CPU/메모리 모두 워커가 새 작업을 가져가지 않고 대기
+    ADMISSION_MAX_CPU_PERCENT = 95
+    ADMISSION_MAX_MEMORY_PERCENT = 90
\ No newline at end of file
@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+import time
+
+PREFIX = "faceblur_"
+
+
+class Metrics:
+    # 프로세스 단위 카운터/게이지/요약 값 (Prometheus text format으로 노출)
+    def __init__(self):
+        self.enabled = True
+        self._lock = Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._summaries = {}
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def add_gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            count, total, maximum = self._summaries.get(key, (0, 0.0, 0.0))
+            self._summaries[key] = (count + 1, total + seconds, max(maximum, seconds))
+
+    def record_stage(self, stage, seconds, timings=None):
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+        self.observe("stage_seconds", seconds, stage=stage)
+
+    @contextmanager
+    def timer(self, stage, timings=None):
+        if not self.enabled and timings is None:
+            yield
+            return
+
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started_at, timings)
+
+    def cache_hit_ratios(self):
+        requests = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                if name != "cache_requests_total":
+                    continue
+                labels = dict(labels)
+                hits, total = requests.get(labels["cache"], (0, 0))
+                if labels["result"] == "hit":
+                    hits += value
+                requests[labels["cache"]] = (hits, total + value)
+
+        return {cache: hits / total for cache, (hits, total) in requests.items() if total}
+
+    def render(self, extra_gauges=None):
+        lines = []
+
+        def format_labels(labels):
+            if not labels:
+                return ""
+            return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+        def emit(metric_type, series):
+            seen = set()
+            for (name, labels), value in sorted(series.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {PREFIX}{name} {metric_type}")
+                    seen.add(name)
+                lines.append(f"{PREFIX}{name}{format_labels(labels)} {value}")
+
+        ratios = self.cache_hit_ratios()
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            summaries = dict(self._summaries)
+
+        for cache, ratio in ratios.items():
+            gauges[("cache_hit_ratio", (("cache", cache),))] = round(ratio, 4)
+        for name, value in (extra_gauges or {}).items():
+            gauges[(name, ())] = value
+        for (name, labels), (_, _, maximum) in summaries.items():
+            gauges[(f"{name}_max", labels)] = round(maximum, 6)
+
+        emit("counter", counters)
+        emit("gauge", gauges)
+
+        seen = set()
+        for (name, labels), (count, total, _) in sorted(summaries.items()):
+            if name not in seen:
+                lines.append(f"# TYPE {PREFIX}{name} summary")
+                seen.add(name)
+            lines.append(f"{PREFIX}{name}_count{format_labels(labels)} {count}")
+            lines.append(f"{PREFIX}{name}_sum{format_labels(labels)} {round(total, 6)}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def start_metrics_server(port, host="0.0.0.0"):
+    # Flask 앱이 없는 워커 프로세스용 /metrics 엔드포인트 (Prometheus가 워커마다 직접 수집)
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -24,6 +24,19 @@ class Job(db.Model):
 
     status = db.Column(db.String(50), default="pending")
     progress = db.Column(db.Float, default=0.0)
+    timings = db.Column(db.String, nullable=True)
+    preview_version = db.Column(db.Integer, default=0)
+
+    # 작업 큐 상태 (task가 있고 worker_id가 없으면 대기 중)
+    task = db.Column(db.String(50), nullable=True)
+    queued_at = db.Column(db.DateTime, nullable=True)
+    worker_id = db.Column(db.String(255), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, default=0)
+
+    # 작업 비용(메가픽셀 x 프레임)과 실제 분석 소요 시간 (처리량 추정용)
+    cost = db.Column(db.Float, default=0.0)
+    run_seconds = db.Column(db.Float, nullable=True)
 
 
 class DetectionLog(db.Model):
@@ -41,3 +54,16 @@ class FaceObject(db.Model):
     label = db.Column(db.String(100), nullable=False)
     ranges = db.Column(db.String, nullable=False)
     meta = db.Column(db.String, nullable=False, default='{ "blur": True }')
+
+
+class Artifact(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey("job.id"), nullable=True)
+    video_id = db.Column(db.Integer, db.ForeignKey("video.id"), nullable=True)
+
+    kind = db.Column(db.String(50), nullable=False)
+    path = db.Column(db.String(500), nullable=False, unique=True)
+    size_bytes = db.Column(db.BigInteger, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,7 +1,12 @@
-from flask import Blueprint, jsonify, current_app, url_for, send_file, request
+from flask import Blueprint, jsonify, current_app, url_for, send_file, send_from_directory, request
 from app.models import Video, Job, DetectionLog, FaceObject
-from app.services.video_services import start_export_job_to_video
+from app.services.video_services import start_export_job_to_video, get_proxy_path
+from app.services.thumbnail_services import get_thumbnail_dir
+from app.services.preview_services import get_preview_filename
+from app.services.storage_services import touch_artifact
+from app.services.admission_services import get_queue_position
 from app.app import db
+from app.metrics import metrics
 
 import os
 import json
@@ -25,14 +30,31 @@ def get_job_status(job_id):
         "progress": job.progress
     }
 
-    if job.status == "running":
-        preview_dir = current_app.config["PREVIEWS_FOLDER"]
-        preview_filename = f"{job.id}_preview.jpg"
+    if job.timings:
+        response_data["timings"] = json.loads(job.timings)
+
+    # 큐에 등록됐지만 아직 워커가 가져가지 않은 상태
+    response_data["queued"] = job.task is not None and job.worker_id is None
+
+    if response_data["queued"]:
+        queue_position = get_queue_position(current_app.config, job.id)
+        if queue_position:
+            response_data["queue_position"], estimated_start = queue_position
+            response_data["estimated_start"] = estimated_start.isoformat() + "Z"
 
-        if os.path.exists(os.path.join(preview_dir, preview_filename)):
-            response_data["preview_url"] = url_for("static", filename=f"previews/{preview_filename}")
+    if job.status == "running":
+        # 버전을 쿼리에 붙여 새 미리보기가 저장될 때만 URL이 바뀌도록 함 (파일 존재 확인 불필요)
+        if job.preview_version:
+            response_data["preview_url"] = url_for(
+                "static",
+                filename=f"previews/{get_preview_filename(job.id)}",
+                v=job.preview_version
+            )
         else:
             response_data["preview_url"] = None
+    elif job.status in ("completed", "rendering", "done"):
+        if os.path.exists(get_proxy_path(current_app, job.video_id)):
+            response_data["proxy_url"] = url_for("video.stream_proxy", video_id=job.video_id)
 
     return jsonify(response_data)
 
@@ -46,6 +68,8 @@ def get_job_results(job_id):
 
     objects = None
 
+    metrics.inc("cache_requests_total", cache="face_objects", result="hit" if face_objects else "miss")
+
     if face_objects:
         for log in logs:
             detection_log.append(json.loads(log.bboxes))
@@ -123,11 +147,36 @@ def get_job_results(job_id):
         
         objects = objects_list
 
+    thumbnail_dir = get_thumbnail_dir(current_app, job_id)
+    thumbnails = set(os.listdir(thumbnail_dir)) if os.path.isdir(thumbnail_dir) else set()
+
+    for obj in objects:
+        filename = f"face_{obj['id']}.jpg"
+        obj["thumbnail_url"] = url_for("job.get_job_thumbnail", job_id=job_id, filename=filename) if filename in thumbnails else None
+
+    timeline = None
+    if "timeline.json" in thumbnails:
+        with open(os.path.join(thumbnail_dir, "timeline.json"), encoding="utf-8") as f:
+            timeline = json.load(f)
+        timeline["sheets"] = [
+            url_for("job.get_job_thumbnail", job_id=job_id, filename=sheet) for sheet in timeline["sheets"]
+        ]
+
     return jsonify({
         "detection_log": detection_log,
-        "objects": objects
+        "objects": objects,
+        "timeline": timeline
     })
 
+@job_bp.route("/<int:job_id>/thumbnails/<path:filename>", methods=["GET"])
+def get_job_thumbnail(job_id, filename):
+    # 탐지 단계에서 한 번 생성된 뒤 바뀌지 않으므로 브라우저 캐시 허용
+    return send_from_directory(
+        get_thumbnail_dir(current_app, job_id),
+        filename,
+        max_age=current_app.config["THUMBNAIL_CACHE_MAX_AGE"]
+    )
+
 @job_bp.route("/<int:job_id>/edits", methods=["POST"])
 def save_job_edits(job_id):
     edited_objects = request.json
@@ -197,15 +246,21 @@ def download_job_video(job_id):
     
     if job.status != "done":
         return jsonify({
-            "error" "Job is not done yet"
+            "error": "Job is not done yet"
         }), 400
     
     output_path = os.path.join(current_app.config["OUTPUTS_FOLDER"], f"job_{job_id}.mp4")
 
     if not os.path.exists(output_path):
+        # 용량 정리로 삭제된 결과 영상은 저장된 편집 내용으로 다시 렌더링
+        start_export_job_to_video(job.id)
         return jsonify({
-            "error": "Output file not found"
-        }), 404
+            "job_id": job.id,
+            "status": "rendering",
+            "message": "Output was evicted and is being re-rendered"
+        }), 202
+
+    touch_artifact(output_path)
     
     video = Video.query.get(job.video_id)
 
@@ -0,0 +1,19 @@
+from flask import Blueprint, Response, current_app
+from app.metrics import metrics
+from app.services.queue_services import get_job_queue
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    if not current_app.config["METRICS_ENABLED"]:
+        return Response("metrics disabled\n", status=404, mimetype="text/plain")
+
+    # 큐 상태는 모든 워커가 공유하는 DB 기준
+    queue = get_job_queue(current_app.config)
+
+    return Response(
+        metrics.render({ "queue_depth": queue.depth(), "queue_active_jobs": queue.active() }),
+        mimetype="text/plain; version=0.0.4"
+    )
@@ -1,9 +1,11 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, send_file
 from werkzeug.utils import secure_filename
 from app.utils import get_video_metadata
 from app.models import Video, Job
 from app.app import db
-from app.services.video_services import start_process_job
+from app.services.video_services import start_process_job, get_proxy_path, start_proxy_rebuild
+from app.services.storage_services import register_artifact, touch_artifact, has_quota_for
+from app.services.admission_services import estimate_cost, exceeds_job_limit, check_admission, get_queue_position
 
 import os
 import uuid
@@ -33,6 +35,11 @@ def upload_video():
             "error": "Unsupported file type"
         }), 400
     
+    if not has_quota_for(current_app, "upload", request.content_length or 0):
+        return jsonify({
+            "error": "Upload storage quota exceeded"
+        }), 507
+
     original_name = secure_filename(file.filename)
     ext = os.path.splitext(original_name)[1]
 
@@ -57,9 +64,19 @@ def upload_video():
         width=width,
         height=height
     )
+
+    # 처리 시간 상한을 설정한 경우 저장/용량 집계 전에 거절
+    if exceeds_job_limit(current_app.config, video):
+        os.remove(save_path)
+        return jsonify({
+            "error": "Video is too large to process (estimated processing time exceeds the limit)"
+        }), 413
+
     db.session.add(video)
     db.session.commit()
 
+    register_artifact("upload", save_path, video_id=video.id)
+
     return jsonify({
         "video_id": video.id,
         "filename_original": video.filename_original,
@@ -82,15 +99,68 @@ def create_job(video_id):
             "error": "Video not found"
         }), 404
     
-    job = Job(video_id=video_id)
+    rejection = check_admission(current_app.config, video)
+
+    if rejection:
+        response = jsonify({
+            "error": rejection["error"]
+        })
+        if rejection["retry_after"]:
+            response.headers["Retry-After"] = str(rejection["retry_after"])
+        return response, rejection["status_code"]
+
+    job = Job(video_id=video_id, cost=estimate_cost(video))
     db.session.add(job)
     db.session.commit()
 
     start_process_job(job.id)
 
-    return jsonify({
+    response_data = {
         "job_id": job.id,
         "video_id": job.video_id,
         "status": job.status,
         "progress": job.progress
-    })
\ No newline at end of file
+    }
+
+    queue_position = get_queue_position(current_app.config, job.id)
+    if queue_position:
+        response_data["queue_position"], estimated_start = queue_position
+        response_data["estimated_start"] = estimated_start.isoformat() + "Z"
+
+    return jsonify(response_data), 202
+
+@video_bp.route("/<int:video_id>/proxy", methods=["GET"])
+def stream_proxy(video_id):
+    video = Video.query.get(video_id)
+
+    if not video:
+        return jsonify({
+            "error": "Video not found"
+        }), 404
+
+    proxy_path = get_proxy_path(current_app, video.id)
+
+    if not os.path.exists(proxy_path):
+        # 분석 중이면 곧 생성되고, 그렇지 않으면 용량 정리로 삭제된 것이므로 다시 생성
+        if Job.query.filter(Job.video_id == video.id, Job.status.in_(("pending", "running"))).count():
+            return jsonify({
+                "error": "Proxy is not ready yet"
+            }), 404
+
+        start_proxy_rebuild(video.id)
+        response = jsonify({
+            "status": "rebuilding"
+        })
+        response.headers["Retry-After"] = "5"
+        return response, 202
+
+    touch_artifact(proxy_path)
+
+    # conditional=True: Range 요청은 206 Partial Content, ETag/Last-Modified 기반 304 응답 지원
+    return send_file(
+        proxy_path,
+        mimetype="video/mp4",
+        conditional=True,
+        etag=True,
+        max_age=current_app.config["PROXY_CACHE_MAX_AGE"]
+    )
\ No newline at end of file
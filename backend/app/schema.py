@@ -0,0 +1,34 @@
+from sqlalchemy import inspect, text
+from app.app import db
+
+
+def upgrade_schema():
+    # db.create_all()은 기존 테이블에 컬럼을 추가하지 않으므로, 모델에 새로 생긴 컬럼만 ALTER TABLE로 추가 (여러 번 실행해도 안전)
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    preparer = db.engine.dialect.identifier_preparer
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = { column["name"] for column in inspector.get_columns(table.name) }
+
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+
+            ddl = f"ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=db.engine.dialect)}"
+
+            # 기존 행에도 기본값을 채워야 attempts + 1 같은 SQL 연산이 NULL이 되지 않음
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if isinstance(default, (int, float)) and not isinstance(default, bool):
+                ddl += f" DEFAULT {default}"
+
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(text(ddl))
+                print(f"[schema] added column {table.name}.{column.name}")
+            except Exception as e:
+                # 다른 프로세스(워커)가 동시에 먼저 추가한 경우
+                print(f"[schema] could not add column {table.name}.{column.name}:", e)
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+from app.models import Job
+from app.metrics import metrics
+
+import heapq
+import psutil
+
+# 작업 종류별 상대 비용 (프록시 재생성은 분석/렌더링보다 훨씬 가벼움)
+TASK_COST_FACTORS = {
+    "detect": 1.0,
+    "export": 1.0,
+    "proxy": 0.1
+}
+
+
+def estimate_cost(video):
+    # 작업 비용 = 처리할 픽셀 수 (메가픽셀 x 프레임)
+    return (video.total_frames or 0) * (video.width or 0) * (video.height or 0) / 1_000_000
+
+def get_throughput(config):
+    # 최근 완료된 분석 작업의 실측 처리량(메가픽셀/초), 기록이 부족하면 설정값 사용
+    recent = Job.query.filter(Job.run_seconds > 0, Job.cost > 0).order_by(Job.id.desc()).limit(20).all()
+    total_seconds = sum(job.run_seconds for job in recent)
+
+    if len(recent) < 3 or total_seconds <= 0:
+        return config["ADMISSION_DEFAULT_MPX_PER_SECOND"]
+    return sum(job.cost for job in recent) / total_seconds
+
+def estimate_seconds(job, throughput):
+    return (job.cost or 0) * TASK_COST_FACTORS.get(job.task, 1.0) / throughput
+
+def get_system_load():
+    # interval=None: 직전 호출 이후의 CPU 사용률 (요청/폴링을 막지 않음)
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory_percent = psutil.virtual_memory().percent
+
+    metrics.set_gauge("system_cpu_percent", cpu_percent)
+    metrics.set_gauge("system_memory_percent", memory_percent)
+    return cpu_percent, memory_percent
+
+def is_overloaded(config):
+    cpu_percent, memory_percent = get_system_load()
+    return cpu_percent >= config["ADMISSION_MAX_CPU_PERCENT"] or memory_percent >= config["ADMISSION_MAX_MEMORY_PERCENT"]
+
+def order_waiting_jobs(jobs, throughput, now=None):
+    # HRRN: (대기 시간 + 예상 처리 시간) / 예상 처리 시간이 큰 순서
+    # 짧은 작업이 먼저 처리되지만, 긴 작업도 기다릴수록 우선순위가 올라가 계속 밀리지 않음
+    now = now or datetime.utcnow()
+
+    def response_ratio(job):
+        service = estimate_seconds(job, throughput) + 1.0
+        waited = (now - job.queued_at).total_seconds() if job.queued_at else 0.0
+        return (waited + service) / service
+
+    return sorted(jobs, key=response_ratio, reverse=True)
+
+def get_queue_snapshot(config, now=None):
+    now = now or datetime.utcnow()
+    throughput = get_throughput(config)
+
+    waiting = Job.query.filter(Job.task.isnot(None), Job.worker_id.is_(None)).all()
+    active = Job.query.filter(Job.worker_id.isnot(None)).all()
+
+    return order_waiting_jobs(waiting, throughput, now), active, throughput
+
+def simulate_start_times(config, waiting, active, throughput):
+    # 워커 슬롯별 종료 예정 시각(초)을 힙으로 두고, 대기 순서대로 가장 먼저 비는 슬롯에 배정
+    slots = max(1, config["JOB_WORKER_SLOTS"], len(active))
+    finish_times = [0.0] * slots
+
+    for job in sorted(active, key=lambda job: job.id):
+        remaining = estimate_seconds(job, throughput) * (1 - (job.progress or 0) / 100)
+        heapq.heapreplace(finish_times, finish_times[0] + max(remaining, 0.0))
+
+    start_times = []
+    for job in waiting:
+        start = finish_times[0]
+        start_times.append(start)
+        heapq.heapreplace(finish_times, start + estimate_seconds(job, throughput))
+
+    return start_times, finish_times[0]
+
+def get_queue_position(config, job_id):
+    # 반환: (대기 순번(1부터), 예상 시작 시각) / 대기 중이 아니면 None
+    now = datetime.utcnow()
+    waiting, active, throughput = get_queue_snapshot(config, now)
+    start_times, _ = simulate_start_times(config, waiting, active, throughput)
+
+    for position, (job, start) in enumerate(zip(waiting, start_times), start=1):
+        if job.id == job_id:
+            return position, now + timedelta(seconds=start)
+
+    return None
+
+def exceeds_job_limit(config, video):
+    # 영상 1개 처리 시간 상한 (기본은 제한 없음)
+    max_seconds = config["ADMISSION_MAX_JOB_SECONDS"]
+    if not max_seconds:
+        return False
+
+    if estimate_cost(video) / get_throughput(config) > max_seconds:
+        metrics.inc("admission_rejected_total", reason="too_large")
+        return True
+    return False
+
+def check_admission(config, video):
+    # 받아들일 수 없으면 { error, status_code, retry_after } 반환, 받아들일 수 있으면 None
+    _, memory_percent = get_system_load()
+
+    if memory_percent >= config["ADMISSION_MAX_MEMORY_PERCENT"]:
+        metrics.inc("admission_rejected_total", reason="memory")
+        return {
+            "error": "Server is under memory pressure, try again later",
+            "status_code": 503,
+            "retry_after": config["ADMISSION_RETRY_AFTER"]
+        }
+
+    waiting, active, throughput = get_queue_snapshot(config)
+
+    if len(waiting) >= config["ADMISSION_MAX_QUEUE_LENGTH"]:
+        metrics.inc("admission_rejected_total", reason="queue_full")
+        return {
+            "error": "Job queue is full, try again later",
+            "status_code": 503,
+            "retry_after": config["ADMISSION_RETRY_AFTER"]
+        }
+
+    # 대기 시간 추정: 새 작업보다 짧은 대기 작업만 앞에 선다고 봄 (HRRN에서 긴 작업은 새 짧은 작업에 곧 추월당함)
+    # 큰 작업 하나가 대기 중이라는 이유로 모든 신규 작업을 거절하지 않도록 함
+    new_seconds = estimate_cost(video) / throughput
+    ahead = [job for job in waiting if estimate_seconds(job, throughput) <= new_seconds]
+    _, backlog_seconds = simulate_start_times(config, ahead, active, throughput)
+
+    if backlog_seconds > config["ADMISSION_MAX_WAIT_SECONDS"]:
+        metrics.inc("admission_rejected_total", reason="backlog")
+        return {
+            "error": "Server is busy, try again later",
+            "status_code": 503,
+            "retry_after": int(max(config["ADMISSION_RETRY_AFTER"], backlog_seconds - config["ADMISSION_MAX_WAIT_SECONDS"]))
+        }
+
+    metrics.inc("admission_accepted_total")
+    return None
@@ -0,0 +1,215 @@
+from collections import deque
+from threading import Lock, Condition
+from app.utils import log_process_stats
+from app.metrics import metrics
+
+import os
+import glob
+import time
+import cv2
+import numpy as np
+
+# 웹 프로세스가 torch/ultralytics/OpenVINO를 import하지 않도록 모델은 처음 필요할 때 로드
+_detector = None
+_detector_lock = Lock()
+
+
+def get_detector(config):
+    global _detector
+
+    metrics.inc("cache_requests_total", cache="detector", result="hit" if _detector is not None else "miss")
+
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = load_detector(config)
+
+    return _detector
+
+def load_detector(config):
+    started_at = time.perf_counter()
+
+    backend = config["DETECTOR_BACKEND"]
+    if backend == "openvino":
+        detector = OpenVINODetector(config)
+    elif backend == "ultralytics":
+        detector = UltralyticsDetector(config)
+    else:
+        raise ValueError(f"Unknown detector backend: {backend}")
+
+    detector.warm_up(config["MODEL_WARMUP_RUNS"])
+
+    log_process_stats(f"detector:{backend}", started_at)
+    return detector
+
+
+class UltralyticsDetector:
+    def __init__(self, config):
+        from ultralytics import YOLO
+
+        self.model = YOLO(config["MODEL_PATH"], task="detect")
+        self.conf = config["DETECTION_CONF"]
+        self.iou = config["DETECTION_IOU"]
+        # YOLO predictor는 스레드 안전하지 않으므로 여러 작업이 모델을 공유할 때 직렬화
+        self._lock = Lock()
+
+    def warm_up(self, runs=1):
+        # 첫 추론에서 발생하는 그래프 컴파일/메모리 할당 비용을 작업 시작 전에 미리 지불
+        dummy = np.zeros((640, 640, 3), dtype=np.uint8)
+        for _ in range(runs):
+            self.detect(dummy)
+
+    def detect(self, img):
+        with self._lock:
+            results = self.model(img, conf=self.conf, iou=self.iou, verbose=False)
+        boxes = results[0].boxes
+
+        return np.hstack([
+            boxes.xyxy.cpu().numpy(),
+            boxes.conf.cpu().numpy()[:, None]
+        ]).astype(np.float32)
+
+    def detect_stream(self, frames):
+        for key, img in frames:
+            yield key, img, self.detect(img)
+
+
+class OpenVINODetector:
+    # ultralytics 전/후처리를 거치지 않고 OpenVINO IR을 직접 실행 (출력: [x1, y1, x2, y2, conf])
+    def __init__(self, config):
+        import openvino as ov
+
+        self._ov = ov
+
+        core = ov.Core()
+        os.makedirs(config["OPENVINO_CACHE_DIR"], exist_ok=True)
+        core.set_property({"CACHE_DIR": config["OPENVINO_CACHE_DIR"]})
+
+        model_xml = glob.glob(os.path.join(config["MODEL_PATH"], "*.xml"))[0]
+        self.compiled = core.compile_model(
+            model_xml,
+            config["OPENVINO_DEVICE"],
+            {"PERFORMANCE_HINT": "THROUGHPUT"}
+        )
+
+        self.input_h, self.input_w = (int(dim) for dim in self.compiled.input(0).shape[2:])
+        self.num_requests = self.compiled.get_property("OPTIMAL_NUMBER_OF_INFER_REQUESTS")
+
+        self.conf = config["DETECTION_CONF"]
+        self.iou = config["DETECTION_IOU"]
+        self.max_det = config["DETECTION_MAX_DET"]
+
+        # 단일 이미지 추론용 동기 요청 (detect 호출마다 AsyncInferQueue를 만들지 않도록 하나만 재사용)
+        self._request = self.compiled.create_infer_request()
+        self._request_lock = Lock()
+
+    def warm_up(self, runs=1):
+        dummy = np.zeros((self.input_h, self.input_w, 3), dtype=np.uint8)
+        frames = [(None, dummy)] * (runs * self.num_requests)
+        for _ in self.detect_stream(frames):
+            pass
+
+    def detect(self, img):
+        blob, letterbox = self.preprocess(img)
+
+        with self._request_lock:
+            self._request.infer({0: blob})
+            output = self._request.get_output_tensor(0).data.copy()
+
+        return self.postprocess(output, img.shape, letterbox)
+
+    def detect_stream(self, frames):
+        # 추론 요청을 num_requests 만큼 비동기로 겹쳐 실행하고, 결과는 입력 순서대로 반환
+        queue = self._ov.AsyncInferQueue(self.compiled, self.num_requests)
+        outputs = {}
+        done = Condition()
+
+        def on_done(request, seq):
+            with done:
+                outputs[seq] = request.get_output_tensor(0).data.copy()
+                done.notify_all()
+
+        queue.set_callback(on_done)
+        pending = deque()
+
+        def drain(max_pending):
+            while pending:
+                seq, key, img, letterbox = pending[0]
+                with done:
+                    if len(pending) > max_pending:
+                        done.wait_for(lambda: seq in outputs)
+                    elif seq not in outputs:
+                        return
+                    output = outputs.pop(seq)
+
+                pending.popleft()
+                yield key, img, self.postprocess(output, img.shape, letterbox)
+
+        for seq, (key, img) in enumerate(frames):
+            blob, letterbox = self.preprocess(img)
+            queue.start_async({0: blob}, seq)
+            pending.append((seq, key, img, letterbox))
+
+            yield from drain(max_pending=self.num_requests)
+
+        queue.wait_all()
+        yield from drain(max_pending=0)
+
+    def preprocess(self, img):
+        # ultralytics LetterBox와 동일: 비율 유지 리사이즈 + 중앙 패딩(114), BGR -> RGB, 0~1 정규화
+        h, w = img.shape[:2]
+        ratio = min(self.input_h / h, self.input_w / w)
+        new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+
+        if (new_w, new_h) != (w, h):
+            img = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+        dw, dh = (self.input_w - new_w) / 2, (self.input_h - new_h) / 2
+        top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+        left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+        img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+
+        blob = img[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+        return np.ascontiguousarray(blob), (ratio, left, top)
+
+    def postprocess(self, output, shape, letterbox):
+        ratio, pad_x, pad_y = letterbox
+
+        # (1, 5, N) -> (N, 5): cx, cy, w, h, conf
+        pred = output[0].T
+        pred = pred[pred[:, 4] > self.conf]
+
+        if len(pred) == 0:
+            return np.empty((0, 5), dtype=np.float32)
+
+        cx, cy, bw, bh, scores = pred.T
+        boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+
+        keep = nms(boxes, scores, self.iou)[:self.max_det]
+        boxes, scores = boxes[keep], scores[keep]
+
+        boxes[:, [0, 2]] = np.clip((boxes[:, [0, 2]] - pad_x) / ratio, 0, shape[1])
+        boxes[:, [1, 3]] = np.clip((boxes[:, [1, 3]] - pad_y) / ratio, 0, shape[0])
+
+        return np.hstack([boxes, scores[:, None]]).astype(np.float32)
+
+
+def nms(boxes, scores, iou_threshold):
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+
+        rest = order[1:]
+        w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-7)
+
+        order = rest[iou <= iou_threshold]
+
+    return np.array(keep, dtype=np.int64)
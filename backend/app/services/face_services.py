@@ -1,68 +1,137 @@
-from ultralytics import YOLO
 from model.sort.sort import Sort
 from flask import current_app
 from app.models import DetectionLog, FaceObject
 from app.app import db
+from app.utils import get_detection_scale, read_frame, rescale_boxes
+from app.services.detector import get_detector
+from app.services.thumbnail_services import FaceThumbnailCollector, TimelineSpriteWriter, get_thumbnail_dir
+from app.services.preview_services import PreviewWriter
+from app.metrics import metrics
 
 import os
 import cv2
-import numpy as np
 import json
 import math
+import time
 
-# model = YOLO("model/yolov11n-face.pt")
-model = YOLO("model/yolov11n-face_openvino_model")
+def commit(timings):
+    with metrics.timer("db_commit", timings):
+        db.session.commit()
 
-def detect_faces(frame_dir, video, job):
+def iter_tracked_faces(detector, frames, width, height, timings=None):
+    # frames: (key, img) 순회. 탐지/추적은 img 해상도에서 하고 bbox는 원본(width x height) 좌표로 변환
+    # 반환: (key, img, img 좌표계의 추적 결과, 원본 좌표계의 bbox 목록)
+    timings = {} if timings is None else timings
     tracker = Sort()
+    stream = detector.detect_stream(frames)
 
-    last_per = 0
-    preview_path = os.path.join(current_app.config["PREVIEWS_FOLDER"], f"{job.id}_preview.jpg")
+    while True:
+        # 프레임 디코딩은 detect_stream 내부에서 일어나므로 대기 시간에서 디코딩 시간을 빼서 추론 시간으로 기록
+        wait_started_at = time.perf_counter()
+        decode_before = timings.get("decode", 0.0)
 
-    for idx, filename in enumerate(sorted(os.listdir(frame_dir)), start=1):
-        frame_path = os.path.join(frame_dir, filename)
+        item = next(stream, None)
+        if item is None:
+            break
 
-        img = cv2.imread(frame_path)
-        results = model(img)
+        key, img, detections = item
+        wait = time.perf_counter() - wait_started_at
+        metrics.record_stage("inference", wait - (timings.get("decode", 0.0) - decode_before), timings)
 
-        detections = []
-        for box in results[0].boxes.xyxy.cpu().numpy():
-            x1, y1, x2, y2 = box[:4]
-            conf = box[4] if len(box) > 4 else 0.9
-            detections.append([x1, y1, x2, y2, conf])
+        with metrics.timer("tracking", timings):
+            tracked_objects = tracker.update(detections) if len(detections) else []
 
-        tracked_objects = tracker.update(np.array(detections)) if len(detections) else []
         bboxes = []
-
-        for x1, y1, x2, y2, track_id in tracked_objects:
+        for x1, y1, x2, y2, track_id in rescale_boxes(tracked_objects, img.shape, width, height):
             bboxes.append({
                 "x": int(x1), "y": int(y1),
                 "w": int(x2-x1), "h": int(y2-y1),
                 "id": int(track_id)
             })
 
-        
-        log = DetectionLog(
-            job_id = job.id,
-            frame_idx = idx,
-            bboxes = json.dumps(bboxes)
-        )
-        db.session.add(log)
+        yield key, img, tracked_objects, bboxes
+
+def blur_regions(img, bboxes):
+    for bbox in bboxes:
+        x, y, w, h = bbox["x"], bbox["y"], bbox["w"], bbox["h"]
+
+        face_region = img[y:y+h, x:x+w]
+        if face_region.size > 0:
+            img[y:y+h, x:x+w] = cv2.GaussianBlur(face_region, (51, 51), 30)
+
+def detect_faces(frame_dir, video, job, timings=None):
+    timings = {} if timings is None else timings
+    started_at = time.perf_counter()
+
+    detector = get_detector(current_app.config)
+    scale = get_detection_scale(
+        video.width, video.height,
+        current_app.config["DETECTION_SCALE"], current_app.config["DETECTION_MIN_SIDE"]
+    )
+
+    last_per = 0
+    preview = PreviewWriter(current_app.config["PREVIEWS_FOLDER"], job.id, current_app.config["PREVIEW_MAX_WIDTH"])
+
+    thumbnail_dir = get_thumbnail_dir(current_app, job.id)
+    faces = FaceThumbnailCollector(thumbnail_dir, current_app.config["THUMBNAIL_SIZE"])
+    timeline = TimelineSpriteWriter(
+        thumbnail_dir,
+        current_app.config["THUMBNAIL_TIMELINE_INTERVAL"],
+        current_app.config["THUMBNAIL_TILE_WIDTH"]
+    )
+
+    def read_frames():
+        for idx, filename in enumerate(sorted(os.listdir(frame_dir)), start=1):
+            with metrics.timer("decode", timings):
+                img = read_frame(os.path.join(frame_dir, filename), scale)
+            yield idx, img
+
+    idx = 0
+
+    try:
+        for idx, img, frame_tracks, bboxes in iter_tracked_faces(detector, read_frames(), video.width, video.height, timings):
+            # 이미 디코딩된 프레임에서 바로 썸네일을 만들어 추가 디코딩 없이 저장
+            with metrics.timer("thumbnails", timings):
+                faces.update(img, frame_tracks)
+                timeline.add(idx, img)
+
+            log = DetectionLog(
+                job_id = job.id,
+                frame_idx = idx,
+                bboxes = json.dumps(bboxes)
+            )
+            db.session.add(log)
 
         
-        progress = (idx / video.total_frames) * 100
-        current_per = math.floor(progress)
+            progress = (idx / video.total_frames) * 100
+            current_per = math.floor(progress)
 
-        if current_per > last_per or (idx - 1) % int(video.fps) == 0:
-            last_per = current_per
-            job.progress = current_per
-            db.session.commit()
+            if current_per > last_per or (idx - 1) % int(video.fps) == 0:
+                last_per = current_per
+                job.progress = current_per
+
+                # 미리보기는 PreviewWriter 스레드가 비동기로 저장 (job.preview_version은 이미 저장 완료된 버전)
+                job.preview_version = preview.version
+                commit(timings)
+
+                with metrics.timer("preview", timings):
+                    preview.submit(img, frame_tracks)
+    finally:
+        preview.close()
+
+    job.preview_version = preview.version
+    commit(timings)
+
+    with metrics.timer("thumbnails", timings):
+        faces.save()
+        timeline.save()
+
+    record_throughput("detect", idx, time.perf_counter() - started_at)
 
-            cv2.imwrite(preview_path, img)
-    
-    db.session.commit()
+def blur_faces(frames_dir, processed_frames_dir, video, job, timings=None):
+    timings = {} if timings is None else timings
+    started_at = time.perf_counter()
 
-def blur_faces(frames_dir, processed_frames_dir, video, job):
     logs = DetectionLog.query.filter_by(job_id=job.id).order_by(DetectionLog.frame_idx).all()
     face_objects = FaceObject.query.filter_by(job_id=job.id).all()
     obj_map = { obj.face_id: obj for obj in face_objects}
@@ -74,7 +143,8 @@ def blur_faces(frames_dir, processed_frames_dir, video, job):
         input_path = os.path.join(frames_dir, frame_file)
         output_path = os.path.join(processed_frames_dir, frame_file)
 
-        img = cv2.imread(input_path)
+        with metrics.timer("decode", timings):
+            img = cv2.imread(input_path)
 
         if img is None:
             continue
@@ -84,8 +154,10 @@ def blur_faces(frames_dir, processed_frames_dir, video, job):
         except:
             bboxes = []
 
+        blur_started_at = time.perf_counter()
+        blur_bboxes = []
         for bbox in bboxes:
-            x, y, w, h, track_id = bbox["x"], bbox["y"], bbox["w"], bbox["h"], bbox["id"]
+            track_id = bbox["id"]
 
             should_blur = False
 
@@ -102,12 +174,13 @@ def blur_faces(frames_dir, processed_frames_dir, video, job):
                 should_blur = True
 
             if should_blur:
-                face_region = img[y:y+h, x:x+w]
-                if face_region.size > 0:
-                    blurred = cv2.GaussianBlur(face_region, (51, 51), 30)
-                    img[y:y+h, x:x+w] = blurred
-        
-        cv2.imwrite(output_path, img)
+                blur_bboxes.append(bbox)
+
+        blur_regions(img, blur_bboxes)
+        metrics.record_stage("blur", time.perf_counter() - blur_started_at, timings)
+
+        with metrics.timer("encode_frame", timings):
+            cv2.imwrite(output_path, img)
 
 
         progress = (idx / video.total_frames) * 100
@@ -116,4 +189,11 @@ def blur_faces(frames_dir, processed_frames_dir, video, job):
         if current_per > last_per:
             last_per = current_per
             job.progress = current_per
-            db.session.commit()
\ No newline at end of file
+            commit(timings)
+
+    record_throughput("blur", len(logs), time.perf_counter() - started_at)
+
+def record_throughput(stage, frame_count, seconds):
+    metrics.inc("frames_processed_total", frame_count, stage=stage)
+    if seconds > 0:
+        metrics.set_gauge("frames_per_second", round(frame_count / seconds, 2), stage=stage)
\ No newline at end of file
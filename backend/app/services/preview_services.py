@@ -0,0 +1,68 @@
+from threading import Thread, Condition
+from app.metrics import metrics
+
+import os
+import time
+import cv2
+
+
+def get_preview_filename(job_id):
+    return f"{job_id}_preview.jpg"
+
+
+class PreviewWriter:
+    # 탐지 루프는 최신 프레임만 슬롯에 넣고 바로 돌아가며, 축소/박스 그리기/저장은 별도 스레드에서 처리
+    def __init__(self, output_dir, job_id, max_width=640):
+        self.output_path = os.path.join(output_dir, get_preview_filename(job_id))
+        self.max_width = max_width
+        self.version = 0
+
+        self._slot = None
+        self._closed = False
+        self._cond = Condition()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, img, tracked_objects):
+        # 아직 저장되지 않은 이전 프레임은 버리고 최신 프레임으로 교체
+        with self._cond:
+            self._slot = (img, tracked_objects)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._slot is not None or self._closed)
+                if self._slot is None:
+                    return
+                img, tracked_objects = self._slot
+                self._slot = None
+
+            started_at = time.perf_counter()
+            try:
+                self._write(img, tracked_objects)
+                self.version += 1
+            except Exception as e:
+                print(f"Preview write failed ({self.output_path}):", e)
+            metrics.record_stage("preview_write", time.perf_counter() - started_at)
+
+    def _write(self, img, tracked_objects):
+        scale = min(1.0, self.max_width / img.shape[1])
+        preview = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else img.copy()
+
+        for x1, y1, x2, y2, track_id in tracked_objects:
+            top_left = (int(x1 * scale), int(y1 * scale))
+            cv2.rectangle(preview, top_left, (int(x2 * scale), int(y2 * scale)), (0, 0, 255), 2)
+            cv2.putText(preview, f"ID: {int(track_id)}", (top_left[0], max(12, top_left[1] - 5)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1, cv2.LINE_AA)
+
+        # 폴링 중인 클라이언트가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{self.output_path}.tmp.jpg"
+        cv2.imwrite(tmp_path, preview, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        os.replace(tmp_path, self.output_path)
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from app.models import Job
+from app.app import db
+
+
+class DatabaseJobQueue:
+    # Job 테이블 자체를 큐로 사용. 여러 워커(프로세스/서버)가 같은 DB를 보고 작업을 가져감
+    # task: 처리할 작업 종류, worker_id: 가져간 워커 (None이면 대기 중)
+    def enqueue(self, job, task):
+        job.task = task
+        job.worker_id = None
+        job.heartbeat_at = None
+        job.queued_at = datetime.utcnow()
+        # 재시도 횟수는 현재 작업 기준
+        job.attempts = 0
+        db.session.commit()
+
+    def claim(self, worker_id, order=None):
+        # order: 대기 작업 목록을 처리 순서대로 정렬하는 함수 (없으면 등록 순서)
+        candidates = (
+            Job.query
+            .filter(Job.task.isnot(None), Job.worker_id.is_(None))
+            .order_by(Job.queued_at)
+            .all()
+        )
+        if order:
+            candidates = order(candidates)
+
+        for candidate in candidates[:10]:
+            # 조건부 UPDATE로 선점: 다른 워커가 먼저 가져갔다면 rowcount가 0
+            claimed = (
+                Job.query
+                .filter(Job.id == candidate.id, Job.worker_id.is_(None), Job.task.isnot(None))
+                .update({
+                    "worker_id": worker_id,
+                    "heartbeat_at": datetime.utcnow(),
+                    "attempts": Job.attempts + 1
+                }, synchronize_session=False)
+            )
+            db.session.commit()
+
+            if claimed:
+                db.session.expire_all()
+                return Job.query.get(candidate.id)
+
+        return None
+
+    def heartbeat(self, job_id, worker_id):
+        Job.query.filter_by(id=job_id, worker_id=worker_id).update(
+            { "heartbeat_at": datetime.utcnow() }, synchronize_session=False
+        )
+        db.session.commit()
+
+    def complete(self, job_id, worker_id):
+        Job.query.filter_by(id=job_id, worker_id=worker_id).update(
+            { "task": None, "worker_id": None, "heartbeat_at": None }, synchronize_session=False
+        )
+        db.session.commit()
+
+    def requeue_stale(self, timeout_seconds, max_attempts):
+        # 하트비트가 끊긴 워커(프로세스 종료, 서버 다운)의 작업을 다시 대기열로 돌림
+        deadline = datetime.utcnow() - timedelta(seconds=timeout_seconds)
+        stale_jobs = (
+            db.session.query(Job.id, Job.worker_id, Job.task, Job.attempts)
+            .filter(Job.worker_id.isnot(None), Job.heartbeat_at < deadline)
+            .all()
+        )
+
+        requeued = 0
+        for job_id, stale_worker_id, task, attempts in stale_jobs:
+            changes = { "worker_id": None, "heartbeat_at": None, "queued_at": datetime.utcnow() }
+
+            if task == "proxy":
+                # 프록시는 다시 요청될 때 재생성되므로 작업만 버림 (Job 상태는 그대로 유지)
+                changes["task"] = None
+            elif attempts >= max_attempts:
+                changes.update({ "status": "failed", "progress": 0.0, "task": None })
+            elif task == "detect":
+                changes.update({ "status": "pending", "progress": 0.0 })
+            elif task == "export":
+                changes.update({ "status": "rendering", "progress": 0.0 })
+
+            # claim과 같이 조건부 UPDATE: 다른 워커가 먼저 되돌렸거나 다시 가져간 작업이면 rowcount가 0
+            updated = (
+                Job.query
+                .filter(
+                    Job.id == job_id,
+                    Job.worker_id == stale_worker_id,
+                    Job.task == task,
+                    Job.heartbeat_at < deadline
+                )
+                .update(changes, synchronize_session=False)
+            )
+            db.session.commit()
+
+            if updated:
+                requeued += 1
+                print(f"Requeue stale job {job_id} (worker: {stale_worker_id}, task: {task}, attempts: {attempts})")
+
+        return requeued
+
+    def depth(self):
+        return Job.query.filter(Job.task.isnot(None), Job.worker_id.is_(None)).count()
+
+    def active(self):
+        return Job.query.filter(Job.worker_id.isnot(None)).count()
+
+
+JOB_QUEUES = {
+    "database": DatabaseJobQueue
+}
+
+def get_job_queue(config):
+    return JOB_QUEUES[config["JOB_QUEUE_BACKEND"]]()
@@ -0,0 +1,131 @@
+from flask import current_app
+from threading import Thread, Event
+from datetime import datetime, timedelta
+from app.models import Artifact, Job
+from app.app import db
+from app.metrics import metrics
+
+import os
+import shutil
+
+# 삭제해도 원본(업로드)에서 다시 만들 수 있는 파생 산출물만 LRU 정리 대상
+EVICTABLE_KINDS = ("frames", "proxy", "output")
+ACTIVE_JOB_STATUSES = ("pending", "running", "rendering")
+
+_cleanup_event = Event()
+# 경로별 마지막으로 접근 시각을 DB에 기록한 시각 (프로세스 단위)
+_last_touched = {}
+
+
+def get_path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    total = 0
+    for root, _, files in os.walk(path):
+        for filename in files:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+    return total
+
+def remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+def register_artifact(kind, path, job_id=None, video_id=None):
+    # 산출물 크기를 DB에 기록 (같은 경로면 크기/접근 시각만 갱신)
+    path = os.path.abspath(path)
+    now = datetime.utcnow()
+
+    artifact = Artifact.query.filter_by(path=path).first()
+    if not artifact:
+        artifact = Artifact(kind=kind, path=path, job_id=job_id, video_id=video_id, created_at=now)
+        db.session.add(artifact)
+
+    artifact.size_bytes = get_path_size(path)
+    artifact.last_accessed_at = now
+    db.session.commit()
+
+    request_cleanup()
+    return artifact
+
+def touch_artifact(path):
+    # 접근 시각은 LRU 순서용이므로 짧은 간격의 반복 접근(프록시 Range 요청 등)은 DB에 쓰지 않음
+    path = os.path.abspath(path)
+    now = datetime.utcnow()
+    interval = timedelta(seconds=current_app.config["STORAGE_TOUCH_INTERVAL"])
+
+    last_touched = _last_touched.get(path)
+    if last_touched and now - last_touched < interval:
+        return
+    _last_touched[path] = now
+
+    Artifact.query.filter(Artifact.path == path, Artifact.last_accessed_at < now - interval).update(
+        { "last_accessed_at": now }, synchronize_session=False
+    )
+    db.session.commit()
+
+def get_usage_bytes(kind):
+    return db.session.query(db.func.coalesce(db.func.sum(Artifact.size_bytes), 0)).filter_by(kind=kind).scalar()
+
+def has_quota_for(app, kind, incoming_bytes):
+    quota_mb = app.config["STORAGE_QUOTAS_MB"].get(kind)
+    if quota_mb is None:
+        return True
+    return get_usage_bytes(kind) + incoming_bytes <= quota_mb * 1024 * 1024
+
+def is_artifact_in_use(artifact):
+    # 진행 중이거나 큐에 등록된 작업이 쓰는 산출물인지 (삭제 직전에 매번 다시 확인)
+    query = Job.query.filter(db.or_(Job.status.in_(ACTIVE_JOB_STATUSES), Job.task.isnot(None)))
+
+    if artifact.job_id is not None:
+        return query.filter(Job.id == artifact.job_id).count() > 0
+    return query.filter(Job.video_id == artifact.video_id).count() > 0
+
+def enforce_quotas(app):
+    for kind, quota_mb in app.config["STORAGE_QUOTAS_MB"].items():
+        artifacts = Artifact.query.filter_by(kind=kind).order_by(Artifact.last_accessed_at).all()
+        total = sum(artifact.size_bytes or 0 for artifact in artifacts)
+        limit = quota_mb * 1024 * 1024
+
+        if kind in EVICTABLE_KINDS:
+            for artifact in artifacts:
+                if total <= limit:
+                    break
+                # 목록을 읽은 뒤 시작된 작업(렌더링 등)도 있을 수 있으므로 삭제 직전에 확인
+                if is_artifact_in_use(artifact):
+                    continue
+
+                remove_path(artifact.path)
+                total -= artifact.size_bytes or 0
+                db.session.delete(artifact)
+                db.session.commit()
+                metrics.inc("storage_evictions_total", kind=kind)
+
+        metrics.set_gauge("storage_bytes", total, kind=kind)
+        metrics.set_gauge("storage_quota_bytes", limit, kind=kind)
+
+def request_cleanup():
+    _cleanup_event.set()
+
+def start_storage_manager(app):
+    thread = Thread(target=storage_manager_loop, args=(app,), daemon=True)
+    thread.start()
+    return thread
+
+def storage_manager_loop(app):
+    # 요청 스레드를 막지 않도록 정리 작업은 이 스레드에서만 수행 (주기 실행 + 산출물 등록 시 즉시 실행)
+    while True:
+        _cleanup_event.wait(app.config["STORAGE_CLEANUP_INTERVAL"])
+        _cleanup_event.clear()
+
+        with app.app_context():
+            try:
+                enforce_quotas(app)
+            except Exception as e:
+                db.session.rollback()
+                print("Error enforcing storage quotas:", e)
@@ -0,0 +1,124 @@
+import os
+import json
+import cv2
+import numpy as np
+
+
+def get_thumbnail_dir(app, job_id):
+    return os.path.join(app.config["THUMBNAILS_FOLDER"], f"job_{job_id}")
+
+
+class FaceThumbnailCollector:
+    # 트랙(face_id)별로 가장 크고 선명한 얼굴 크롭 하나만 메모리에 유지하고, 탐지가 끝나면 저장
+    def __init__(self, output_dir, size=96, padding=0.2):
+        self.output_dir = output_dir
+        self.size = size
+        self.padding = padding
+        self.best = {}
+
+    def update(self, img, tracked_objects):
+        img_h, img_w = img.shape[:2]
+
+        for x1, y1, x2, y2, track_id in tracked_objects:
+            w, h = x2 - x1, y2 - y1
+            if w < 8 or h < 8:
+                continue
+
+            area = w * h
+            best = self.best.get(int(track_id))
+            # 크기가 현재 최고의 절반도 안 되는 후보는 선명도 계산 없이 건너뜀
+            if best and area < best[1] * 0.5:
+                continue
+
+            pad_x, pad_y = w * self.padding, h * self.padding
+            left, top = int(max(0, x1 - pad_x)), int(max(0, y1 - pad_y))
+            right, bottom = int(min(img_w, x2 + pad_x)), int(min(img_h, y2 + pad_y))
+            crop = img[top:bottom, left:right]
+            if crop.size == 0:
+                continue
+
+            sharpness = cv2.Laplacian(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var()
+            score = area * np.log1p(sharpness)
+
+            if not best or score > best[0]:
+                self.best[int(track_id)] = (score, area, self._square(crop))
+
+    def _square(self, crop):
+        h, w = crop.shape[:2]
+        side = max(h, w)
+        square = np.zeros((side, side, 3), dtype=np.uint8)
+        square[(side - h) // 2:(side - h) // 2 + h, (side - w) // 2:(side - w) // 2 + w] = crop
+
+        return cv2.resize(square, (self.size, self.size), interpolation=cv2.INTER_AREA)
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        for track_id, (_, _, crop) in self.best.items():
+            cv2.imwrite(os.path.join(self.output_dir, f"face_{track_id}.jpg"), crop, [cv2.IMWRITE_JPEG_QUALITY, 85])
+
+
+class TimelineSpriteWriter:
+    # interval 프레임마다 축소 프레임을 타일로 모아 스프라이트 시트(sprite_000.jpg ...)와 timeline.json 생성
+    def __init__(self, output_dir, interval=30, tile_width=160, columns=10, rows=10):
+        self.output_dir = output_dir
+        self.interval = max(1, interval)
+        self.tile_width = tile_width
+        self.tile_height = None
+        self.columns = columns
+        self.rows = rows
+
+        self.tiles = []
+        self.sheets = []
+        self.count = 0
+
+    def add(self, frame_idx, img):
+        if (frame_idx - 1) % self.interval != 0:
+            return
+
+        if self.tile_height is None:
+            img_h, img_w = img.shape[:2]
+            self.tile_height = max(1, round(self.tile_width * img_h / img_w))
+
+        self.tiles.append(cv2.resize(img, (self.tile_width, self.tile_height), interpolation=cv2.INTER_AREA))
+        self.count += 1
+
+        if len(self.tiles) == self.columns * self.rows:
+            self._flush()
+
+    def _flush(self):
+        if not self.tiles:
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        used_rows = (len(self.tiles) + self.columns - 1) // self.columns
+        sheet = np.zeros((used_rows * self.tile_height, self.columns * self.tile_width, 3), dtype=np.uint8)
+
+        for i, tile in enumerate(self.tiles):
+            row, col = divmod(i, self.columns)
+            y, x = row * self.tile_height, col * self.tile_width
+            sheet[y:y+self.tile_height, x:x+self.tile_width] = tile
+
+        filename = f"sprite_{len(self.sheets):03d}.jpg"
+        cv2.imwrite(os.path.join(self.output_dir, filename), sheet, [cv2.IMWRITE_JPEG_QUALITY, 75])
+
+        self.sheets.append(filename)
+        self.tiles = []
+
+    def save(self):
+        self._flush()
+
+        if not self.sheets:
+            return
+
+        with open(os.path.join(self.output_dir, "timeline.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "interval": self.interval,
+                "count": self.count,
+                "tile_width": self.tile_width,
+                "tile_height": self.tile_height,
+                "columns": self.columns,
+                "rows": self.rows,
+                "sheets": self.sheets
+            }, f)
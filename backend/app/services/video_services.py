@@ -1,49 +1,145 @@
 from flask import current_app
-from threading import Thread
-from app.models import Video, Job
+from app.models import Video, Job, DetectionLog
 from app.app import db
-from app.utils import extract_frames, frames_to_video
-from app.services.face_services import detect_faces, blur_faces
+from app.utils import extract_frames, frames_to_video, start_proxy_transcode
+from app.metrics import metrics
+from app.services.storage_services import register_artifact, touch_artifact, remove_path
+from app.services.queue_services import get_job_queue
 
 import os
+import json
+import time
+import uuid
 
 
 def start_process_job(job_id):
-    app = current_app._get_current_object()
-    thread=Thread(target=extract_and_detect_task, args=(app, job_id))
-    thread.start()
+    # 실제 처리는 워커가 큐에서 가져가서 수행
+    job = Job.query.get(job_id)
+    get_job_queue(current_app.config).enqueue(job, "detect")
 
 def extract_and_detect_task(app, job_id):
+    # ML 스택은 작업 스레드에서만 import (웹 요청 처리 경로에서는 로드하지 않음)
+    from app.services.face_services import detect_faces
+
     with app.app_context():
         job = Job.query.get(job_id)
         video = Video.query.get(job.video_id)
 
         job.status = "running"
+        # 워커 장애로 재시도되는 경우 이전 시도의 탐지 결과 제거
+        DetectionLog.query.filter_by(job_id=job.id).delete()
         db.session.commit()
 
         video_path = os.path.join(app.config["UPLOADS_FOLDER"], video.filename_stored)
         frame_dir = os.path.join(app.config["FRAMES_FOLDER"], f"job_{job_id}")
         os.makedirs(frame_dir, exist_ok=True)
 
+        timings = {}
+        started_at = time.perf_counter()
+        metrics.add_gauge("active_workers", 1)
+        proxy = start_proxy(app, video)
+
         try:
-            extract_frames(video_path, frame_dir)
-            detect_faces(frame_dir, video, job)
+            with metrics.timer("extract_frames", timings):
+                extract_frames(video_path, frame_dir)
+            register_artifact("frames", frame_dir, job_id=job.id)
+
+            detect_faces(frame_dir, video, job, timings)
+            finish_proxy(proxy, timings, video.id)
 
             job.status = "completed"
             job.progress = 100.0
+            job.run_seconds = time.perf_counter() - started_at
+            save_timings(job, timings)
             db.session.commit()
         except Exception as e:
             job.status = "failed"
             job.progress = 0.0
+            save_timings(job, timings)
             db.session.commit()
             print("Error processing video:", e)
+        finally:
+            metrics.add_gauge("active_workers", -1)
+            discard_proxy(proxy)
+
+def get_proxy_path(app, video_id):
+    return os.path.join(app.config["PROXIES_FOLDER"], f"video_{video_id}.mp4")
+
+def start_proxy(app, video):
+    # 프록시 인코딩은 별도 ffmpeg 프로세스로 탐지와 동시에 진행
+    proxy_path = get_proxy_path(app, video.id)
+    if os.path.exists(proxy_path):
+        return None
+
+    # 같은 영상의 작업/프록시 재생성이 동시에 돌 수 있으므로 임시 파일은 실행마다 따로 사용 (완료 시 원자적으로 교체)
+    tmp_path = f"{os.path.splitext(proxy_path)[0]}.{uuid.uuid4().hex}.tmp.mp4"
+    video_path = os.path.join(app.config["UPLOADS_FOLDER"], video.filename_stored)
+
+    process = start_proxy_transcode(
+        video_path, tmp_path, video.fps,
+        app.config["PROXY_HEIGHT"], app.config["PROXY_GOP_SECONDS"], app.config["PROXY_MAX_BITRATE"]
+    )
+    return process, tmp_path, proxy_path
+
+def finish_proxy(proxy, timings, video_id):
+    if not proxy:
+        return
+
+    process, tmp_path, proxy_path = proxy
+
+    with metrics.timer("proxy_wait", timings):
+        returncode = process.wait()
+
+    if returncode == 0:
+        os.replace(tmp_path, proxy_path)
+        register_artifact("proxy", proxy_path, video_id=video_id)
+    else:
+        print(f"Proxy transcode failed ({returncode}): {proxy_path}")
+
+def discard_proxy(proxy):
+    # 작업 실패 등으로 끝나지 못한 프록시 인코딩 정리
+    if not proxy:
+        return
+
+    process, tmp_path, _ = proxy
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+def start_proxy_rebuild(video_id):
+    # 용량 정리로 삭제된 프록시를 요청 시점에 다시 생성 (같은 영상은 한 번만, 다른 작업이 없는 Job에 실어서 큐에 등록)
+    jobs = Job.query.filter_by(video_id=video_id).order_by(Job.id.desc()).all()
+    if not jobs or any(job.task == "proxy" for job in jobs):
+        return
+
+    idle_job = next((job for job in jobs if job.task is None), None)
+    if idle_job:
+        get_job_queue(current_app.config).enqueue(idle_job, "proxy")
+
+def rebuild_proxy_task(app, video_id):
+    with app.app_context():
+        video = Video.query.get(video_id)
+        proxy = start_proxy(app, video)
+
+        try:
+            finish_proxy(proxy, {}, video.id)
+        except Exception as e:
+            print("Error rebuilding proxy:", e)
+        finally:
+            discard_proxy(proxy)
 
 def start_export_job_to_video(job_id):
-    app = current_app._get_current_object()
-    thread = Thread(target=blur_and_export_task, args=(app, job_id))
-    thread.start()
+    # 상태를 먼저 바꿔서 워커가 가져가기 전의 상태 조회/중복 요청에도 렌더링 중으로 보이게 함
+    job = Job.query.get(job_id)
+    job.status = "rendering"
+    job.progress = 0.0
+    get_job_queue(current_app.config).enqueue(job, "export")
 
 def blur_and_export_task(app, job_id):
+    from app.services.face_services import blur_faces
+
     with app.app_context():
         job = Job.query.get(job_id)
         video = Video.query.get(job.video_id)
@@ -52,21 +148,51 @@ def blur_and_export_task(app, job_id):
         job.progress = 0.0
         db.session.commit()
 
+        video_path = os.path.join(app.config["UPLOADS_FOLDER"], video.filename_stored)
         frames_dir = os.path.join(app.config["FRAMES_FOLDER"], f"job_{job_id}")
         processed_frames_dir = os.path.join(app.config["PROCESSED_FRAMES_FOLDER"], f"job_{job_id}")
         output_path = os.path.join(app.config["OUTPUTS_FOLDER"], f"job_{job_id}.mp4")
 
         os.makedirs(processed_frames_dir, exist_ok=True)
 
+        timings = {}
+        metrics.add_gauge("active_workers", 1)
+
         try:
-            blur_faces(frames_dir, processed_frames_dir, video, job)
-            frames_to_video(processed_frames_dir, output_path, video.fps)
+            # 용량 정리로 프레임이 삭제됐다면 원본에서 다시 추출 (같은 ffmpeg 설정이므로 프레임 번호 동일)
+            if not os.path.isdir(frames_dir) or not os.listdir(frames_dir):
+                os.makedirs(frames_dir, exist_ok=True)
+                with metrics.timer("extract_frames", timings):
+                    extract_frames(video_path, frames_dir)
+                register_artifact("frames", frames_dir, job_id=job.id)
+            else:
+                touch_artifact(frames_dir)
+
+            blur_faces(frames_dir, processed_frames_dir, video, job, timings)
+            # 렌더링 중 프레임이 삭제됐다면 잘린 영상이 되므로 완료 처리하지 않음
+            if not os.path.isdir(frames_dir) or not os.listdir(frames_dir):
+                raise RuntimeError(f"Frames were removed during rendering: {frames_dir}")
+            with metrics.timer("frames_to_video", timings):
+                frames_to_video(processed_frames_dir, output_path, video.fps)
+            register_artifact("output", output_path, job_id=job.id)
 
             job.status = "done"
             job.progress = 100.0
+            save_timings(job, timings)
             db.session.commit()
         except Exception as e:
             job.status = "failed"
             job.progress = 0.0
+            save_timings(job, timings)
             db.session.commit()
-            print("Error rendering video", e)
\ No newline at end of file
+            print("Error rendering video", e)
+        finally:
+            metrics.add_gauge("active_workers", -1)
+            # 블러 처리된 프레임은 인코딩에만 쓰이므로 바로 삭제
+            remove_path(processed_frames_dir)
+
+def save_timings(job, timings):
+    # 분석/렌더링 단계별 누적 시간(초)을 Job에 합쳐서 저장
+    merged = json.loads(job.timings) if job.timings else {}
+    merged.update({stage: round(seconds, 4) for stage, seconds in timings.items()})
+    job.timings = json.dumps(merged)
\ No newline at end of file
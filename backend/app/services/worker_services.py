@@ -0,0 +1,87 @@
+from threading import Thread, Event
+from app.app import db
+from app.services.queue_services import get_job_queue
+from app.services.admission_services import is_overloaded, get_throughput, order_waiting_jobs
+from app.metrics import metrics
+from app.services.video_services import extract_and_detect_task, blur_and_export_task, rebuild_proxy_task
+
+import os
+import socket
+import threading
+
+TASKS = {
+    "detect": lambda app, job_id, video_id: extract_and_detect_task(app, job_id),
+    "export": lambda app, job_id, video_id: blur_and_export_task(app, job_id),
+    "proxy": lambda app, job_id, video_id: rebuild_proxy_task(app, video_id)
+}
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+def run_worker(app, worker_id=None, stop_event=None):
+    # 큐에서 작업을 하나씩 가져와 처리하는 루프 (웹 프로세스 내 스레드 또는 별도 워커 프로세스에서 실행)
+    worker_id = worker_id or default_worker_id()
+    stop_event = stop_event or Event()
+    queue = get_job_queue(app.config)
+
+    print(f"[worker] {worker_id} started")
+
+    while not stop_event.is_set():
+        claimed = None
+
+        # 이 서버의 CPU/메모리가 한도 이상이면 새 작업을 가져가지 않음 (다른 워커가 처리하거나 부하가 내려간 뒤 처리)
+        if is_overloaded(app.config):
+            metrics.inc("worker_backoff_total")
+            stop_event.wait(app.config["JOB_POLL_INTERVAL"])
+            continue
+
+        with app.app_context():
+            try:
+                queue.requeue_stale(app.config["JOB_HEARTBEAT_TIMEOUT"], app.config["JOB_MAX_ATTEMPTS"])
+                throughput = get_throughput(app.config)
+                job = queue.claim(worker_id, order=lambda jobs: order_waiting_jobs(jobs, throughput))
+                if job:
+                    claimed = (job.id, job.task, job.video_id)
+            except Exception as e:
+                db.session.rollback()
+                print(f"[worker] {worker_id} failed to claim a job:", e)
+
+        if not claimed:
+            stop_event.wait(app.config["JOB_POLL_INTERVAL"])
+            continue
+
+        run_claimed_job(app, queue, worker_id, *claimed)
+
+def run_claimed_job(app, queue, worker_id, job_id, task, video_id):
+    done = Event()
+    heartbeat = Thread(target=heartbeat_loop, args=(app, queue, worker_id, job_id, done), daemon=True)
+    heartbeat.start()
+
+    try:
+        TASKS[task](app, job_id, video_id)
+    except Exception as e:
+        print(f"[worker] {worker_id} job {job_id} ({task}) raised:", e)
+    finally:
+        done.set()
+        heartbeat.join()
+
+        with app.app_context():
+            queue.complete(job_id, worker_id)
+
+def heartbeat_loop(app, queue, worker_id, job_id, done):
+    while not done.wait(app.config["JOB_HEARTBEAT_INTERVAL"]):
+        with app.app_context():
+            try:
+                queue.heartbeat(job_id, worker_id)
+            except Exception as e:
+                db.session.rollback()
+                print(f"[worker] {worker_id} heartbeat failed for job {job_id}:", e)
+
+def start_local_workers(app, count):
+    threads = []
+    for _ in range(count):
+        thread = Thread(target=run_worker, args=(app,), daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
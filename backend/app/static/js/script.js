@@ -36,6 +36,7 @@ document.addEventListener('DOMContentLoaded', () => {
     // 중앙 패널
     const mainVideo = document.getElementById('main-video');
     const mainTimelineSeek = document.getElementById('main-timeline-seek');
+    const timelineHoverPreview = document.getElementById('timeline-hover-preview');
     const playbackControls = document.getElementById('playback-controls');
     const rewindButton = document.getElementById('rewind-button');
     const playPauseButton = document.getElementById('play-pause-button');
@@ -72,7 +73,11 @@ document.addEventListener('DOMContentLoaded', () => {
 
     let videoFPS = 30
     let videoTotalFrames = 0
+    let videoSourceWidth = 0         // 원본 영상 가로 해상도 (bbox 좌표 기준)
+    let videoSourceScale = 1         // 재생 중인 영상(프록시) 해상도 / 원본 해상도
+    let localVideoURL = null
     let allDetectionData = []
+    let timelineSprites = null       // 서버에서 받은 타임라인 스프라이트 시트 정보
     let baseFrameImage = new Image()
     let videoDrawParams = {}
 
@@ -156,6 +161,7 @@ document.addEventListener('DOMContentLoaded', () => {
         selectedFile = file;
         const fileURL = URL.createObjectURL(file)
 
+        localVideoURL = fileURL
         mainVideo.src = fileURL
 
         mainVideo.addEventListener('seeked', () => {
@@ -225,6 +231,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             videoFPS = uploadResult.fps
             videoTotalFrames = uploadResult.total_frames
+            videoSourceWidth = uploadResult.width
 
             await handleProcessVideo(uploadResult.video_id)
 
@@ -260,10 +267,14 @@ document.addEventListener('DOMContentLoaded', () => {
 
             currentJobID = job.job_id
 
-            updateStatus(`작업(ID: ${job.job_id})이 시작되었습니다. 상태 확인 중...`, 'info', true, job.progress || 0)
+            if (job.queue_position) {
+                updateStatus(`작업(ID: ${job.job_id})이 등록되었습니다. ${formatQueueStatus(job)}`, 'info', true, 0)
+            } else {
+                updateStatus(`작업(ID: ${job.job_id})이 시작되었습니다. 상태 확인 중...`, 'info', true, job.progress || 0)
+            }
 
             const statusUrl = `/jobs/${job.job_id}/status`
-            await pollForJobStatus(statusUrl)
+            const finalStatus = await pollForJobStatus(statusUrl)
 
             console.log("처리는 끝!!")
             
@@ -278,11 +289,16 @@ document.addEventListener('DOMContentLoaded', () => {
 
             allDetectionData = analysisResult.detection_log
             detectedObjects = analysisResult.objects
+            timelineSprites = analysisResult.timeline
 
             populateObjectList(detectedObjects)
             updateStatus('분석 완료! 편집 모드가 활성화되었습니다.', 'success')
             progressBar.classList.add('hidden')
 
+            if (finalStatus.proxy_url) {
+                await switchToProxyVideo(finalStatus.proxy_url)
+            }
+
             initializeEditor()
 
         } catch (error) {
@@ -294,6 +310,21 @@ document.addEventListener('DOMContentLoaded', () => {
         exportButton.disabled = false
     }
     
+    function formatQueueStatus(data) {
+        if (!data.queue_position) {
+            return '작업 대기 중... (처리 가능한 워커를 기다리고 있습니다)'
+        }
+
+        let message = `작업 대기 중... (대기 순번: ${data.queue_position})`
+
+        if (data.estimated_start) {
+            const waitSeconds = Math.max(0, Math.round((new Date(data.estimated_start) - Date.now()) / 1000))
+            message = `작업 대기 중... (대기 순번: ${data.queue_position}, 예상 시작: 약 ${Math.ceil(waitSeconds / 60)}분 후)`
+        }
+
+        return message
+    }
+
     async function pollForJobStatus(statusUrl) {
         const POLLING_INTERVAL = 1000
 
@@ -313,12 +344,14 @@ document.addEventListener('DOMContentLoaded', () => {
 
                 if (data.status === 'completed') {
                     updateStatus('작업 완료. 결과 데이터를 가져옵니다...', 'success', true, 100)
-                    return true
+                    return data
                 } else if (data.status === 'done') {
                     updateStatus('작업 완료.', 'success', true, 100)
-                    return true
+                    return data
                 } else if (data.status === 'failed') {
                     throw new Error(data.error_message || '서버에서 작업이 실패했습니다.')
+                } else if (data.status === 'pending' || (data.queued && data.status === 'rendering')) {
+                    updateStatus(formatQueueStatus(data), 'info', true, 0)
                 } else if (data.status === 'running' || data.status === 'rendering') {
                     const progress = data.progress || 0
                     updateStatus(`작업 진행 중... (${progress}%)`, 'info', true, progress)
@@ -335,6 +368,23 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    /**
+     * 편집기 재생 영상을 서버의 저해상도 프록시로 교체합니다. (실패 시 로컬 원본 유지)
+     * @param {string} url - 서버가 제공한 proxy_url
+     */
+    function switchToProxyVideo(url) {
+        return new Promise(resolve => {
+            mainVideo.addEventListener('loadeddata', resolve, { once: true })
+            mainVideo.addEventListener('error', () => {
+                console.warn('프록시 영상을 불러오지 못해 원본으로 편집합니다.')
+                mainVideo.src = localVideoURL
+                mainVideo.addEventListener('loadeddata', resolve, { once: true })
+            }, { once: true })
+
+            mainVideo.src = url
+        })
+    }
+
     /**
      * [신규] 헬퍼: 현재 프레임이 객체의 ranges 배열 중 하나에 포함되는지 확인
      * @param {number} frameIndex - 현재 비디오 프레임 인덱스
@@ -376,7 +426,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 ctx.filter = 'blur(8px)';
                 ctx.drawImage(
                 mainVideo,      // 원본 이미지
-                    bbox.x, bbox.y, bbox.w, bbox.h,  // [소스] 원본 영상의 좌표
+                    bbox.x * videoSourceScale, bbox.y * videoSourceScale,  // [소스] 재생 중인 영상의 좌표
+                    bbox.w * videoSourceScale, bbox.h * videoSourceScale,
                     canvasX, canvasY, canvasW, canvasH  // [타겟] 캔버스의 스케일링된 좌표
                 );
                 ctx.restore();
@@ -417,9 +468,11 @@ document.addEventListener('DOMContentLoaded', () => {
             // 2. 스케일링된 이미지 그리기
             ctx.drawImage(baseFrameImage, offsetX, offsetY, newWidth, newHeight);
             
-            // 3. (요구사항) bboxes는 그리지 않습니다.
+            // 3. bboxes는 서버에서 미리보기 이미지에 그려서 보내줍니다.
         };
-        baseFrameImage.src = url + '?t=' + new Date().getTime()
+        // preview_url에는 서버가 버전(v)을 붙여주므로 새 미리보기가 있을 때만 다시 받아옵니다.
+        if (baseFrameImage.src.endsWith(url)) return;
+        baseFrameImage.src = url
     }
 
     /**
@@ -454,8 +507,10 @@ document.addEventListener('DOMContentLoaded', () => {
     function initializeEditor() {
         // [핵심] 편집 모드 시작 시, 비디오의 렌더링 좌표를 *한 번만* 계산하여
         // 전역 변수 'videoDrawParams'에 저장합니다.
-        const vidWidth = mainVideo.videoWidth;
-        const vidHeight = mainVideo.videoHeight;
+        // bbox는 원본 해상도 좌표이므로, 프록시로 재생 중이면 원본 크기 기준으로 스케일 계산
+        videoSourceScale = videoSourceWidth ? mainVideo.videoWidth / videoSourceWidth : 1;
+        const vidWidth = mainVideo.videoWidth / videoSourceScale;
+        const vidHeight = mainVideo.videoHeight / videoSourceScale;
         
         const scale = Math.min(CANVAS_WIDTH / vidWidth, CANVAS_HEIGHT / vidHeight);
         const newWidth = vidWidth * scale;
@@ -472,6 +527,9 @@ document.addEventListener('DOMContentLoaded', () => {
         playbackControls.classList.remove('hidden');
 
         // 이벤트 리스너 연결
+        mainTimelineSeek.addEventListener('mousemove', showTimelineHoverPreview);
+        mainTimelineSeek.addEventListener('mouseleave', () => timelineHoverPreview.classList.add('hidden'));
+
         mainTimelineSeek.addEventListener('input', () => {
             if (isPlaying) {
                 isPlaying = false;
@@ -522,6 +580,32 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    /**
+     * 타임라인 위에 마우스를 올리면 스프라이트 시트에서 해당 시점의 썸네일을 보여줍니다. (영상 디코딩 없음)
+     * @param {MouseEvent} e
+     */
+    function showTimelineHoverPreview(e) {
+        if (!timelineSprites || timelineSprites.count === 0) return;
+
+        const rect = mainTimelineSeek.getBoundingClientRect();
+        const ratio = Math.min(Math.max((e.clientX - rect.left) / rect.width, 0), 1);
+        const frameIndex = Math.round(ratio * (videoTotalFrames - 1));
+
+        const { interval, count, tile_width, tile_height, columns, rows, sheets } = timelineSprites;
+        const tileIndex = Math.min(Math.floor(frameIndex / interval), count - 1);
+        const perSheet = columns * rows;
+        const sheetIndex = Math.floor(tileIndex / perSheet);
+        const col = (tileIndex % perSheet) % columns;
+        const row = Math.floor((tileIndex % perSheet) / columns);
+
+        timelineHoverPreview.style.width = `${tile_width}px`;
+        timelineHoverPreview.style.height = `${tile_height}px`;
+        timelineHoverPreview.style.backgroundImage = `url(${sheets[sheetIndex]})`;
+        timelineHoverPreview.style.backgroundPosition = `-${col * tile_width}px -${row * tile_height}px`;
+        timelineHoverPreview.style.left = `${(e.clientX - rect.left) - tile_width / 2}px`;
+        timelineHoverPreview.classList.remove('hidden');
+    }
+
     /**
      * [신규] 캔버스 클릭 시, bboxes를 히트 테스트하여 객체 선택/토글
      */
@@ -595,10 +679,13 @@ document.addEventListener('DOMContentLoaded', () => {
             li.className = 'object-item';
             li.dataset.id = obj.id; // data-id 속성에 객체 ID 저장
 
-            // 썸네일 이미지
-            // const img = document.createElement('img');
-            // img.src = obj.thumbnailUrl; // TODO: 실제 썸네일 URL 필드명으로 변경
-            // img.alt = '탐지된 얼굴 썸네일';
+            // 썸네일 이미지 (탐지 단계에서 트랙별로 저장된 얼굴 크롭)
+            const img = document.createElement('img');
+            if (obj.thumbnail_url) {
+                img.src = obj.thumbnail_url;
+            }
+            img.alt = '탐지된 얼굴 썸네일';
+            img.loading = 'lazy';
 
             // [신규] 2. 텍스트 정보 (이름 + 블러 상태)
             const textContainer = document.createElement('div');
@@ -615,7 +702,7 @@ document.addEventListener('DOMContentLoaded', () => {
             blurSpan.className = 'object-blur-status';
             blurSpan.textContent = obj.meta.blur ? '🚫 블러됨' : '👁️ 표시됨';
 
-            // li.appendChild(img);
+            li.appendChild(img);
             textContainer.appendChild(labelSpan);
             textContainer.appendChild(blurSpan);
             li.appendChild(textContainer);
@@ -966,6 +1053,13 @@ document.addEventListener('DOMContentLoaded', () => {
         try {
             const response = await fetch(`/jobs/${currentJobID}/download`)
 
+            // 서버 용량 정리로 결과 영상이 삭제된 경우 다시 렌더링한 뒤 재시도
+            if (response.status === 202) {
+                updateStatus('보관 기간이 지난 결과 영상을 다시 생성합니다...', 'info', true, 0);
+                await pollForJobStatus(`/jobs/${currentJobID}/status`);
+                return handleDownload();
+            }
+
             if (!response.ok) {
                 throw new Error('영상 다운로드 실패');
             }
@@ -1,6 +1,17 @@
 import cv2
 import ffmpeg
+import numpy as np
 import os
+import sys
+import time
+import psutil
+
+REDUCED_IMREAD_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
 
 def get_video_metadata(file_path):
     cap = cv2.VideoCapture(file_path)
@@ -18,8 +29,65 @@ def get_video_metadata(file_path):
 
     return fps, total_frames, duration, width, height
 
+# 워커에서 재시도할 때 이전 시도가 남긴 파일이 있어도 덮어쓰기 확인 프롬프트에서 멈추지 않도록 -nostdin + overwrite_output
 def extract_frames(video_path, output_dir):
-    ffmpeg.input(video_path).output(os.path.join(output_dir, "frame_%04d.jpg"), qscale=2).run()
+    ffmpeg.input(video_path).output(os.path.join(output_dir, "frame_%04d.jpg"), qscale=2).global_args("-nostdin").overwrite_output().run()
 
 def frames_to_video(frames_dir, output_path, fps):
-    ffmpeg.input(os.path.join(frames_dir, "frame_%04d.jpg"), framerate=fps).output(output_path, vcodec="libx264", pix_fmt="yuv420p").run()
\ No newline at end of file
+    ffmpeg.input(os.path.join(frames_dir, "frame_%04d.jpg"), framerate=fps).output(output_path, vcodec="libx264", pix_fmt="yuv420p").global_args("-nostdin").overwrite_output().run()
+
+def start_proxy_transcode(video_path, output_path, fps, height=480, gop_seconds=0.5, max_bitrate="1M"):
+    # 키프레임 간격을 짧게 하고 moov atom을 앞으로 옮겨 브라우저에서 Range 요청만으로 빠르게 탐색 가능하게 함
+    gop = max(1, round((fps or 30) * gop_seconds))
+
+    return (
+        ffmpeg
+        .input(video_path)
+        .output(
+            output_path,
+            vcodec="libx264", preset="veryfast", crf=30,
+            maxrate=max_bitrate, bufsize=max_bitrate,
+            g=gop, keyint_min=gop, sc_threshold=0,
+            vf=f"scale=-2:'min({height},ih)'",
+            pix_fmt="yuv420p", movflags="+faststart", an=None
+        )
+        .global_args("-loglevel", "error", "-nostats", "-nostdin")
+        .overwrite_output()
+        .run_async()
+    )
+
+def get_detection_scale(width, height, scale="auto", min_side=960):
+    if scale != "auto":
+        return int(scale) if int(scale) in REDUCED_IMREAD_FLAGS else 1
+
+    long_side = max(width or 0, height or 0)
+    if not long_side:
+        return 1
+
+    best = 1
+    for factor in sorted(REDUCED_IMREAD_FLAGS):
+        if long_side / factor >= min_side:
+            best = factor
+    return best
+
+def read_frame(frame_path, scale=1):
+    # JPEG은 축소 디코딩 시 DCT 단계에서 크기를 줄이므로 전체 디코딩보다 훨씬 빠름
+    return cv2.imread(frame_path, REDUCED_IMREAD_FLAGS.get(scale, cv2.IMREAD_COLOR))
+
+def rescale_boxes(boxes, src_shape, dst_width, dst_height):
+    # 축소 좌표계의 [x1, y1, x2, y2, ...] 박스를 원본 해상도 좌표로 변환 (프레임 범위로 클리핑)
+    if len(boxes) == 0 or not dst_width or not dst_height:
+        return boxes
+
+    src_h, src_w = src_shape[:2]
+    boxes = np.array(boxes, dtype=np.float32)
+    boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]] * (dst_width / src_w), 0, dst_width)
+    boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]] * (dst_height / src_h), 0, dst_height)
+    return boxes
+
+def log_process_stats(role, started_at):
+    elapsed = time.perf_counter() - started_at
+    rss_mb = psutil.Process().memory_info().rss / (1024 * 1024)
+    ml_loaded = [name for name in ("torch", "ultralytics", "openvino") if name in sys.modules]
+
+    print(f"[{role}] ready in {elapsed:.2f}s, rss {rss_mb:.1f}MB, ml modules: {ml_loaded or 'none'}")
\ No newline at end of file
@@ -0,0 +1,235 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from app.config import Config
+from app.utils import get_video_metadata, get_detection_scale
+
+import argparse
+import json
+import os
+import time
+import cv2
+import ffmpeg
+import numpy as np
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+# 메타데이터의 프레임 수는 추정치일 수 있으므로 이 비율(또는 최소 FRAME_COUNT_SLACK 프레임)까지는 차이 허용
+FRAME_COUNT_TOLERANCE = 0.01
+FRAME_COUNT_SLACK = 2
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="웹 서버/DB 없이 폴더(또는 목록 파일)의 영상들을 일괄 얼굴 블러 처리합니다. (backend 폴더에서 python batch.py)"
+    )
+    parser.add_argument("input", help="영상 폴더 또는 영상 경로를 한 줄에 하나씩 적은 목록 파일")
+    parser.add_argument("--output-dir", required=True, help="결과 영상 저장 폴더 (입력 폴더 구조 유지)")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 처리할 영상 수")
+    parser.add_argument("--manifest", default=None, help="완료 기록 파일 (기본: <output-dir>/completed.jsonl)")
+    parser.add_argument("--backend", default=None, help="DETECTOR_BACKEND 덮어쓰기 (openvino / ultralytics)")
+    parser.add_argument("--detection-scale", default=None, help="DETECTION_SCALE 덮어쓰기 (1/2/4/8/auto)")
+    return parser.parse_args()
+
+def build_config(args):
+    config = { key: getattr(Config, key) for key in dir(Config) if key.isupper() }
+
+    if args.backend:
+        config["DETECTOR_BACKEND"] = args.backend
+    if args.detection_scale:
+        config["DETECTION_SCALE"] = args.detection_scale
+
+    return config
+
+def collect_inputs(input_path):
+    # 반환: (영상 경로, 출력 폴더 기준 상대 경로) 목록
+    if os.path.isdir(input_path):
+        inputs = []
+        for root, _, files in os.walk(input_path):
+            for filename in files:
+                if filename.lower().endswith(VIDEO_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    inputs.append((os.path.abspath(path), os.path.relpath(path, input_path)))
+        return sorted(inputs)
+
+    paths = []
+    with open(input_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                path = os.path.abspath(line)
+                if path not in paths:
+                    paths.append(path)
+
+    if not paths:
+        return []
+
+    # 파일 이름이 같은 영상(a/IMG_0001.MOV, b/IMG_0001.MOV)이 겹치지 않도록 공통 상위 폴더 기준 경로 유지
+    base_dir = os.path.commonpath([os.path.dirname(path) for path in paths])
+    return [(path, os.path.relpath(path, base_dir)) for path in paths]
+
+def load_completed(manifest_path):
+    completed = set()
+
+    if not os.path.exists(manifest_path):
+        return completed
+
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 중단 시점에 반쯤 쓰인 마지막 줄은 무시
+                continue
+            if entry.get("status") == "done":
+                completed.add(entry["input"])
+
+    return completed
+
+def get_output_path(output_dir, relative_path, keep_ext=False):
+    name, ext = os.path.splitext(relative_path)
+    if keep_ext:
+        name = f"{name}_{ext.lstrip('.').lower()}"
+    return os.path.join(output_dir, f"{name}_blurred.mp4")
+
+def assign_output_paths(inputs, output_dir):
+    # 확장자만 다른 영상(clip.mp4, clip.mov)은 출력 이름이 겹치므로 확장자를 이름에 포함
+    def output_key(relative):
+        return os.path.splitext(relative)[0].lower()
+
+    counts = {}
+    for _, relative in inputs:
+        counts[output_key(relative)] = counts.get(output_key(relative), 0) + 1
+
+    return {
+        path: get_output_path(output_dir, relative, keep_ext=counts[output_key(relative)] > 1)
+        for path, relative in inputs
+    }
+
+def anonymize_video(video_path, output_path, config, detector):
+    # 웹 작업과 같은 탐지/추적/블러 로직을 쓰되, 프레임을 JPEG로 저장하지 않고 ffmpeg 파이프로 바로 처리
+    from app.services.face_services import iter_tracked_faces, blur_regions
+
+    fps, total_frames, duration, width, height = get_video_metadata(video_path)
+    if not width or not height:
+        raise ValueError("Unable to read video metadata")
+
+    scale = get_detection_scale(width, height, config["DETECTION_SCALE"], config["DETECTION_MIN_SIDE"])
+    detect_size = (-(-width // scale), -(-height // scale))
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{os.path.splitext(output_path)[0]}.tmp.mp4"
+
+    source = (
+        ffmpeg
+        .input(video_path)
+        .output("pipe:", format="rawvideo", pix_fmt="bgr24")
+        .global_args("-loglevel", "error", "-nostats")
+        .run_async(pipe_stdout=True)
+    )
+    sink = (
+        ffmpeg
+        .input("pipe:", format="rawvideo", pix_fmt="bgr24", s=f"{width}x{height}", framerate=fps or 30)
+        .output(tmp_path, vcodec="libx264", pix_fmt="yuv420p")
+        .global_args("-loglevel", "error", "-nostats")
+        .overwrite_output()
+        .run_async(pipe_stdin=True)
+    )
+
+    def read_frames():
+        frame_bytes = width * height * 3
+        while True:
+            buffer = source.stdout.read(frame_bytes)
+            if len(buffer) < frame_bytes:
+                return
+
+            img = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3).copy()
+            small = cv2.resize(img, detect_size, interpolation=cv2.INTER_AREA) if scale > 1 else img
+            yield img, small
+
+    frame_count = 0
+    try:
+        for img, _, _, bboxes in iter_tracked_faces(detector, read_frames(), width, height):
+            blur_regions(img, bboxes)
+            sink.stdin.write(img.tobytes())
+            frame_count += 1
+    finally:
+        sink.stdin.close()
+        source.stdout.close()
+        source.wait()
+        sink.wait()
+
+    # 손상/잘린 입력은 디코더가 일찍 끝나 짧은 결과가 나오므로 완료로 기록하지 않음
+    error = None
+    if sink.returncode != 0:
+        error = f"ffmpeg encode failed ({sink.returncode})"
+    elif source.returncode != 0:
+        error = f"ffmpeg decode failed ({source.returncode})"
+    elif total_frames and abs(frame_count - total_frames) > max(FRAME_COUNT_SLACK, total_frames * FRAME_COUNT_TOLERANCE):
+        error = f"decoded {frame_count} of {total_frames} frames"
+
+    if error:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise RuntimeError(error)
+
+    os.replace(tmp_path, output_path)
+    return frame_count
+
+def main():
+    args = parse_args()
+    config = build_config(args)
+
+    manifest_path = args.manifest or os.path.join(args.output_dir, "completed.jsonl")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    inputs = collect_inputs(args.input)
+    completed = load_completed(manifest_path)
+    pending = [(path, relative) for path, relative in inputs if path not in completed]
+    output_paths = assign_output_paths(inputs, args.output_dir)
+
+    print(f"[batch] {len(inputs)} videos, {len(inputs) - len(pending)} already done, {len(pending)} to process")
+    if not pending:
+        return
+
+    from app.services.detector import get_detector
+    detector = get_detector(config)
+
+    started_at = time.perf_counter()
+    total_frames = 0
+    failed = 0
+
+    def process(path, relative):
+        file_started_at = time.perf_counter()
+        frames = anonymize_video(path, output_paths[path], config, detector)
+        return frames, time.perf_counter() - file_started_at
+
+    # 검출기(모델)는 한 번만 로드해서 모든 작업 스레드가 공유
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor, open(manifest_path, "a", encoding="utf-8") as manifest:
+        futures = { executor.submit(process, path, relative): path for path, relative in pending }
+
+        for future in as_completed(futures):
+            path = futures[future]
+            entry = { "input": path, "finished_at": datetime.now().isoformat(timespec="seconds") }
+
+            try:
+                frames, seconds = future.result()
+                total_frames += frames
+                entry.update({ "status": "done", "frames": frames, "seconds": round(seconds, 2) })
+                print(f"[batch] done   {path} ({frames} frames, {frames / seconds:.1f} fps)")
+            except Exception as e:
+                failed += 1
+                entry.update({ "status": "failed", "error": str(e) })
+                print(f"[batch] failed {path}: {e}")
+
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            manifest.flush()
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"[batch] {len(pending) - failed}/{len(pending)} succeeded, {failed} failed, "
+        f"{total_frames} frames in {elapsed:.1f}s ({total_frames / elapsed:.1f} fps, "
+        f"{(len(pending) - failed) / elapsed * 60:.2f} videos/min)"
+    )
+
+
+if __name__ == "__main__":
+    main()
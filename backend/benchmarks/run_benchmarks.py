@@ -0,0 +1,333 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from app.app import create_app, db
+from app.config import Config
+from app.models import Video, Job
+from app.utils import get_video_metadata, extract_frames, frames_to_video, get_detection_scale, read_frame
+from benchmarks.synthetic import load_face_crops, make_synthetic_video
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import numpy as np
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="합성 영상으로 단계별 처리량과 API 지연시간을 측정해 JSON으로 저장합니다. (backend 폴더에서 python -m benchmarks.run_benchmarks)"
+    )
+    parser.add_argument("--resolutions", default="1280x720,1920x1080", help="쉼표로 구분한 WxH 목록")
+    parser.add_argument("--durations", default="5", help="쉼표로 구분한 영상 길이(초) 목록")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--faces-dir", default=None, help="붙여 넣을 얼굴 크롭 이미지 폴더")
+    parser.add_argument("--faces-per-frame", type=int, default=3)
+    parser.add_argument("--backend", default=None, help="DETECTOR_BACKEND 덮어쓰기 (openvino / ultralytics)")
+    parser.add_argument("--detection-scale", default=None, help="DETECTION_SCALE 덮어쓰기 (1/2/4/8/auto)")
+    parser.add_argument("--concurrency", type=int, default=8, help="API 부하 테스트 동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=50, help="클라이언트당 요청 수")
+    parser.add_argument("--parity", action="store_true", help="같은 프레임으로 openvino / ultralytics 백엔드 결과(박스 IoU, 신뢰도 차이) 비교")
+    parser.add_argument("--parity-frames", type=int, default=100, help="백엔드 비교에 쓸 최대 프레임 수")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 경로")
+    return parser.parse_args()
+
+def bench_config(tmp_dir, args):
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+        "UPLOADS_FOLDER": os.path.join(tmp_dir, "uploads"),
+        "FRAMES_FOLDER": os.path.join(tmp_dir, "frames"),
+        "PROCESSED_FRAMES_FOLDER": os.path.join(tmp_dir, "processed_frames"),
+        "OUTPUTS_FOLDER": os.path.join(tmp_dir, "outputs"),
+        "PREVIEWS_FOLDER": os.path.join(tmp_dir, "previews"),
+        # 벤치마크 DB는 항상 job 1부터 시작하므로 실제 서버의 산출물 폴더에 쓰지 않도록 모두 임시 폴더로
+        "THUMBNAILS_FOLDER": os.path.join(tmp_dir, "thumbnails"),
+        "PROXIES_FOLDER": os.path.join(tmp_dir, "proxies"),
+    }
+    if args.backend:
+        overrides["DETECTOR_BACKEND"] = args.backend
+    if args.detection_scale:
+        overrides["DETECTION_SCALE"] = args.detection_scale
+
+    for key, value in overrides.items():
+        if key.endswith("_FOLDER"):
+            os.makedirs(value, exist_ok=True)
+
+    return type("BenchConfig", (Config,), overrides)
+
+def timed(func):
+    started_at = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started_at, result
+
+def stage_result(seconds, frames):
+    return {
+        "seconds": round(seconds, 4),
+        "frames": frames,
+        "fps": round(frames / seconds, 2) if seconds > 0 else None
+    }
+
+def match_boxes(expected, actual, iou_threshold=0.5):
+    # IoU가 큰 쌍부터 1:1로 매칭, 반환: (expected 인덱스, actual 인덱스, IoU) 목록
+    if not len(expected) or not len(actual):
+        return []
+
+    a, b = expected[:, :4], actual[:, :4]
+    w = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    h = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = w * h
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    iou = inter / (area_a[:, None] + area_b[None, :] - inter + 1e-7)
+
+    matches = []
+    while True:
+        i, j = np.unravel_index(iou.argmax(), iou.shape)
+        if iou[i, j] < iou_threshold:
+            return matches
+        matches.append((i, j, float(iou[i, j])))
+        iou[i, :] = -1
+        iou[:, j] = -1
+
+def measure_parity(config, frame_dir, scale, max_frames):
+    # 같은 프레임을 두 백엔드로 추론해 비교 (ultralytics 결과 기준)
+    from app.services.detector import OpenVINODetector, UltralyticsDetector
+
+    reference = UltralyticsDetector(config)
+    candidate = OpenVINODetector(config)
+
+    filenames = sorted(os.listdir(frame_dir))[:max_frames]
+    reference_boxes = candidate_boxes = 0
+    ious, conf_diffs = [], []
+
+    for filename in filenames:
+        img = read_frame(os.path.join(frame_dir, filename), scale)
+        expected = reference.detect(img)
+        actual = candidate.detect(img)
+
+        reference_boxes += len(expected)
+        candidate_boxes += len(actual)
+        for i, j, iou in match_boxes(expected, actual):
+            ious.append(iou)
+            conf_diffs.append(abs(float(expected[i, 4]) - float(actual[j, 4])))
+
+    def summarize(values, func):
+        return round(float(func(values)), 4) if values else None
+
+    return {
+        "frames": len(filenames),
+        "reference_backend": "ultralytics",
+        "candidate_backend": "openvino",
+        "reference_boxes": reference_boxes,
+        "candidate_boxes": candidate_boxes,
+        "matched_boxes": len(ious),
+        "mean_iou": summarize(ious, np.mean),
+        "min_iou": summarize(ious, np.min),
+        "mean_conf_diff": summarize(conf_diffs, np.mean),
+        "max_conf_diff": summarize(conf_diffs, np.max)
+    }
+
+def summarize_latencies(latencies, wall_seconds):
+    latencies_ms = np.array(latencies) * 1000
+
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / wall_seconds, 2),
+        "mean_ms": round(float(latencies_ms.mean()), 2),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+        "max_ms": round(float(latencies_ms.max()), 2)
+    }
+
+def measure_endpoint(app, url, concurrency, requests_per_client):
+    def client_loop(_):
+        client = app.test_client()
+        latencies = []
+        for _ in range(requests_per_client):
+            started_at = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}")
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started_at = time.perf_counter()
+        results = list(executor.map(client_loop, range(concurrency)))
+        wall_seconds = time.perf_counter() - started_at
+
+    return summarize_latencies([latency for result in results for latency in result], wall_seconds)
+
+def run_case(args, width, height, seconds, faces):
+    from app.services.detector import get_detector
+    from app.services.face_services import detect_faces, blur_faces
+    from model.sort.sort import Sort
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp_dir:
+        config = bench_config(tmp_dir, args)
+        app = create_app(config)
+
+        video_path = os.path.join(config.UPLOADS_FOLDER, "synthetic.mp4")
+        make_synthetic_video(video_path, width, height, seconds, args.fps, faces, args.faces_per_frame)
+
+        frame_dir = os.path.join(config.FRAMES_FOLDER, "job_1")
+        processed_dir = os.path.join(config.PROCESSED_FRAMES_FOLDER, "job_1")
+        output_path = os.path.join(config.OUTPUTS_FOLDER, "job_1.mp4")
+        os.makedirs(frame_dir)
+        os.makedirs(processed_dir)
+
+        stages = {}
+
+        with app.app_context():
+            db.create_all()
+
+            fps, total_frames, duration, video_width, video_height = get_video_metadata(video_path)
+            video = Video(
+                filename_original="synthetic.mp4",
+                filename_stored="synthetic.mp4",
+                size_mb=round(os.path.getsize(video_path) / (1024 * 1024), 2),
+                fps=fps,
+                total_frames=total_frames,
+                duration=duration,
+                width=video_width,
+                height=video_height
+            )
+            db.session.add(video)
+            db.session.commit()
+
+            job = Job(video_id=video.id, status="running")
+            db.session.add(job)
+            db.session.commit()
+
+            model_load_seconds, detector = timed(lambda: get_detector(app.config))
+
+            elapsed, _ = timed(lambda: extract_frames(video_path, frame_dir))
+            frame_count = len(os.listdir(frame_dir))
+            stages["extract_frames"] = stage_result(elapsed, frame_count)
+
+            # 추론만 따로 측정하고, 그 결과로 Sort.update를 단독 측정
+            scale = get_detection_scale(video.width, video.height, app.config["DETECTION_SCALE"], app.config["DETECTION_MIN_SIDE"])
+            frames = (
+                (idx, read_frame(os.path.join(frame_dir, filename), scale))
+                for idx, filename in enumerate(sorted(os.listdir(frame_dir)), start=1)
+            )
+            elapsed, detections = timed(lambda: [dets for _, _, dets in detector.detect_stream(frames)])
+            stages["inference"] = stage_result(elapsed, frame_count)
+
+            parity = None
+            if args.parity:
+                parity = measure_parity(app.config, frame_dir, scale, args.parity_frames)
+                print(
+                    f"[bench] parity: {parity['matched_boxes']}/{parity['reference_boxes']} boxes matched "
+                    f"(openvino {parity['candidate_boxes']}), mean IoU {parity['mean_iou']}, max conf diff {parity['max_conf_diff']}"
+                )
+
+            detection_count = sum(len(dets) for dets in detections)
+            frames_with_detections = sum(1 for dets in detections if len(dets))
+            if detection_count == 0:
+                print("[bench] WARNING: no faces detected - tracking/blur/results measure an empty workload (use --faces-dir with real face crops)")
+
+            # 실제 파이프라인과 같이 검출이 있는 프레임에서만 update가 호출되므로 호출 횟수 기준으로 처리량 계산
+            tracker = Sort()
+            elapsed, _ = timed(lambda: [tracker.update(dets) for dets in detections if len(dets)])
+            stages["sort_update"] = stage_result(elapsed, frames_with_detections)
+
+            elapsed, _ = timed(lambda: detect_faces(frame_dir, video, job))
+            stages["detect_faces"] = stage_result(elapsed, frame_count)
+
+            job.status = "completed"
+            job.progress = 100.0
+            db.session.commit()
+
+            # 첫 /results 요청은 FaceObject를 생성하므로 측정 전에 한 번 호출
+            app.test_client().get(f"/jobs/{job.id}/results")
+            api = {
+                "status": measure_endpoint(app, f"/jobs/{job.id}/status", args.concurrency, args.requests),
+                "results": measure_endpoint(app, f"/jobs/{job.id}/results", args.concurrency, args.requests)
+            }
+
+            elapsed, _ = timed(lambda: blur_faces(frame_dir, processed_dir, video, job))
+            stages["blur_faces"] = stage_result(elapsed, frame_count)
+
+            elapsed, _ = timed(lambda: frames_to_video(processed_dir, output_path, video.fps))
+            stages["frames_to_video"] = stage_result(elapsed, frame_count)
+
+            detector_backend = app.config["DETECTOR_BACKEND"]
+
+    return {
+        "resolution": f"{width}x{height}",
+        "seconds": seconds,
+        "fps": args.fps,
+        "frames": frame_count,
+        "detector_backend": detector_backend,
+        "detection_scale": scale,
+        "model_load_seconds": round(model_load_seconds, 4),
+        "detections": detection_count,
+        "frames_with_detections": frames_with_detections,
+        "stages": stages,
+        "api": api,
+        "parity": parity
+    }
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(current, baseline):
+    baseline_cases = {(case["resolution"], case["seconds"]): case for case in baseline["cases"]}
+
+    for case in current["cases"]:
+        old = baseline_cases.get((case["resolution"], case["seconds"]))
+        if not old:
+            continue
+
+        print(f"\n== {case['resolution']} / {case['seconds']}s (vs {baseline['meta'].get('git_revision')}) ==")
+        for stage, result in case["stages"].items():
+            old_result = old["stages"].get(stage)
+            if old_result and old_result["fps"] and result["fps"]:
+                print(f"  {stage:<16} {old_result['fps']:>9.2f} -> {result['fps']:>9.2f} fps  (x{result['fps'] / old_result['fps']:.2f})")
+        for endpoint, result in case["api"].items():
+            old_result = old["api"].get(endpoint)
+            if old_result:
+                print(f"  /{endpoint:<15} p95 {old_result['p95_ms']:>8.2f} -> {result['p95_ms']:>8.2f} ms")
+
+def main():
+    args = parse_args()
+    faces = load_face_crops(args.faces_dir)
+
+    cases = []
+    for resolution in args.resolutions.split(","):
+        width, height = (int(value) for value in resolution.lower().split("x"))
+        for seconds in args.durations.split(","):
+            print(f"[bench] {width}x{height}, {seconds}s")
+            cases.append(run_case(args, width, height, float(seconds), faces))
+
+    results = {
+        "meta": {
+            "git_revision": git_revision(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "faces_dir": args.faces_dir
+        },
+        "cases": cases
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"[bench] results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare_results(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
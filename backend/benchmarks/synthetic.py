@@ -0,0 +1,87 @@
+import os
+import glob
+import cv2
+import ffmpeg
+import numpy as np
+
+
+def draw_face(size=96):
+    # 얼굴 크롭 이미지가 없을 때 쓰는 대체 스프라이트 (얼굴로 검출되지 않을 가능성이 높아 추적/블러 단계는 빈 작업이 됨)
+    img = np.full((size, size, 3), (40, 40, 40), dtype=np.uint8)
+    center = size // 2
+
+    cv2.ellipse(img, (center, center), (int(size * 0.35), int(size * 0.45)), 0, 0, 360, (140, 170, 215), -1)
+    cv2.circle(img, (int(size * 0.37), int(size * 0.4)), max(2, size // 16), (30, 30, 30), -1)
+    cv2.circle(img, (int(size * 0.63), int(size * 0.4)), max(2, size // 16), (30, 30, 30), -1)
+    cv2.ellipse(img, (center, int(size * 0.68)), (int(size * 0.15), int(size * 0.06)), 0, 0, 180, (60, 60, 150), 2)
+
+    return img
+
+def load_face_crops(faces_dir=None):
+    crops = []
+
+    if faces_dir:
+        for path in sorted(glob.glob(os.path.join(faces_dir, "*"))):
+            img = cv2.imread(path)
+            if img is not None:
+                crops.append(img)
+
+    return crops or [draw_face()]
+
+def make_synthetic_video(output_path, width, height, seconds, fps=30, faces=None, faces_per_frame=3, seed=0):
+    # ffmpeg testsrc2 배경 위에 얼굴 크롭을 움직이며 붙여 넣어 H.264 영상으로 인코딩
+    faces = faces or [draw_face()]
+    rng = np.random.default_rng(seed)
+
+    face_size = max(32, height // 6)
+    sprites = []
+    for i in range(faces_per_frame):
+        crop = cv2.resize(faces[i % len(faces)], (face_size, face_size))
+        position = rng.uniform([0, 0], [width - face_size, height - face_size])
+        velocity = rng.uniform(-1, 1, size=2) * (width / (fps * 4))
+        sprites.append([crop, position, velocity])
+
+    source = (
+        ffmpeg
+        .input(f"testsrc2=size={width}x{height}:rate={fps}:duration={seconds}", f="lavfi")
+        .output("pipe:", format="rawvideo", pix_fmt="bgr24")
+        .run_async(pipe_stdout=True, quiet=True)
+    )
+    sink = (
+        ffmpeg
+        .input("pipe:", format="rawvideo", pix_fmt="bgr24", s=f"{width}x{height}", framerate=fps)
+        .output(output_path, vcodec="libx264", pix_fmt="yuv420p")
+        .overwrite_output()
+        .run_async(pipe_stdin=True, quiet=True)
+    )
+
+    frame_bytes = width * height * 3
+    frame_count = 0
+
+    while True:
+        buffer = source.stdout.read(frame_bytes)
+        if len(buffer) < frame_bytes:
+            break
+
+        frame = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3).copy()
+
+        for sprite in sprites:
+            crop, position, velocity = sprite
+            position += velocity
+
+            for axis, limit in ((0, width - face_size), (1, height - face_size)):
+                if not 0 <= position[axis] <= limit:
+                    velocity[axis] = -velocity[axis]
+                    position[axis] = min(max(position[axis], 0), limit)
+
+            x, y = int(position[0]), int(position[1])
+            frame[y:y+face_size, x:x+face_size] = crop
+
+        sink.stdin.write(frame.tobytes())
+        frame_count += 1
+
+    sink.stdin.close()
+    source.wait()
+    sink.wait()
+
+    return frame_count
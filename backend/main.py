@@ -1,9 +1,22 @@
+import time
+started_at = time.perf_counter()
+
 from app.app import create_app, db
+from app.schema import upgrade_schema
+from app.utils import log_process_stats
+from app.services.storage_services import start_storage_manager
+from app.services.worker_services import start_local_workers
 
 app = create_app()
 
 with app.app_context():
     db.create_all()
+    upgrade_schema()
+
+start_storage_manager(app)
+start_local_workers(app, app.config["JOB_WORKERS_IN_PROCESS"])
+
+log_process_stats("web", started_at)
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,67 @@
+import time
+started_at = time.perf_counter()
+
+from threading import Thread
+from app.app import create_app, db
+from app.schema import upgrade_schema
+from app.utils import log_process_stats
+from app.metrics import start_metrics_server
+from app.services.worker_services import run_worker
+from app.services.storage_services import start_storage_manager
+
+import argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="공유 DB의 작업 큐에서 분석/렌더링 작업을 가져와 처리하는 워커입니다. (backend 폴더에서 python worker.py)"
+    )
+    parser.add_argument("--worker-id", default=None, help="워커 이름 (기본: <호스트명>-<pid>-<스레드>)")
+    parser.add_argument("--threads", type=int, default=1, help="이 프로세스에서 동시에 처리할 작업 수 (검출기는 공유)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="워커 지표를 노출할 포트 (기본: WORKER_METRICS_PORT, 0이면 끔)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    app = create_app()
+
+    with app.app_context():
+        db.create_all()
+        upgrade_schema()
+
+    # 단계별 시간/처리량/캐시 지표는 이 프로세스 메모리에만 쌓이므로 워커가 직접 노출
+    metrics_port = app.config["WORKER_METRICS_PORT"] if args.metrics_port is None else args.metrics_port
+    if app.config["METRICS_ENABLED"] and metrics_port:
+        try:
+            start_metrics_server(metrics_port)
+            print(f"[worker] metrics on :{metrics_port}/metrics")
+        except OSError as e:
+            # 같은 서버의 다른 워커 프로세스가 이미 포트를 쓰는 경우 등: 지표 없이 작업 처리는 계속
+            print(f"[worker] WARNING: metrics server disabled, cannot bind port {metrics_port} (use --metrics-port):", e)
+
+    # 워커가 등록한 산출물도 바로 용량 정리가 실행되도록 워커에서도 정리 스레드 실행
+    start_storage_manager(app)
+
+    # 첫 작업이 모델 로딩/워밍업을 기다리지 않도록 미리 로드
+    from app.services.detector import get_detector
+    get_detector(app.config)
+
+    log_process_stats("worker", started_at)
+
+    threads = []
+    for index in range(max(1, args.threads)):
+        worker_id = f"{args.worker_id}-{index}" if args.worker_id else None
+        thread = Thread(target=run_worker, args=(app, worker_id), daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        # 처리 중이던 작업은 하트비트가 끊긴 뒤 다른 워커가 다시 가져감
+        print("[worker] stopped")
+
+
+if __name__ == "__main__":
+    main()